@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from core.database import get_db
-from services.auth_service import AuthService
+from services.auth_service import auth_service
 from schemas.auth import (
     CompanyRegistration, UserLogin, AuthResponse, UserResponse, 
     RefreshToken, UserRoleResponse, UserInviteCreate, UserInviteResponse,
@@ -14,7 +14,6 @@ from models.user import Profile, UserRole
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
-auth_service = AuthService()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -105,23 +104,7 @@ async def get_current_user_info(
     current_user: Profile = Depends(get_current_user)
 ):
     """Get current user information"""
-    return UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        avatar_url=current_user.avatar_url,
-        phone=current_user.phone,
-        is_active=current_user.is_active,
-        last_login=current_user.last_login,
-        preferences=current_user.preferences,
-        company_id=current_user.company_id,
-        role_id=current_user.role_id,
-        role_name=current_user.role.name if current_user.role else None,
-        role_display_name=current_user.role.display_name if current_user.role else None,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at
-    )
+    return auth_service.build_user_response(current_user, current_user.role)
 
 @router.post("/logout")
 async def logout(
@@ -236,14 +219,14 @@ async def change_password(
             )
         
         # Verify current password
-        if not auth_service.verify_password(password_data.current_password, user.password_hash):
+        if not await auth_service.averify_password(password_data.current_password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
         
         # Update password
-        user.password_hash = auth_service.get_password_hash(password_data.new_password)
+        user.password_hash = await auth_service.aget_password_hash(password_data.new_password)
         await db.commit()
         
         return {"message": "Password changed successfully"}
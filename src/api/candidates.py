@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 from typing import Optional, List
 import uuid
 from datetime import datetime
@@ -38,8 +38,7 @@ async def get_candidates(
     try:
         # Base query with joins to get candidate data along with related info
         query = select(Candidate).options(
-            selectinload(Candidate.applications).selectinload(Application.job),
-            selectinload(Candidate.candidate_workflows)
+            selectinload(Candidate.applications).selectinload(Application.job)
         ).where(
             Candidate.company_id == current_user.company_id,
             Candidate.deleted_at.is_(None)
@@ -118,7 +117,7 @@ async def get_candidates(
                 location=candidate.location,
                 jobId=str(latest_application.job_id) if latest_application else "",
                 jobTitle=latest_application.job.title if latest_application and latest_application.job else "No job",
-                applicationDate=latest_application.created_at.isoformat() if latest_application else candidate.created_at.isoformat(),
+                applicationDate=latest_application.created_at if latest_application else candidate.created_at,
                 currentStep=current_step,
                 workflowProgress=workflow_progress,  # We'll populate this later if needed
                 resume={
@@ -128,14 +127,14 @@ async def get_candidates(
                     "fileSize": 0,
                     "fileType": "application/pdf",
                     "downloadUrl": candidate.resume_url or "",
-                    "uploadedAt": candidate.created_at.isoformat()
+                    "uploadedAt": candidate.created_at
                 },
                 communicationHistory=[],  # We'll populate this later if needed
                 status=candidate_status,
                 notes=[], # We'll add notes later if needed
                 companyId=str(candidate.company_id),
-                createdAt=candidate.created_at.isoformat(),
-                updatedAt=candidate.updated_at.isoformat()
+                createdAt=candidate.created_at,
+                updatedAt=candidate.updated_at
             )
             
             candidate_responses.append(candidate_response)
@@ -164,8 +163,7 @@ async def get_candidate(
     """Get a specific candidate by ID"""
     try:
         query = select(Candidate).options(
-            selectinload(Candidate.applications).selectinload(Application.job),
-            selectinload(Candidate.candidate_workflows)
+            selectinload(Candidate.applications).selectinload(Application.job)
         ).where(
             Candidate.id == uuid.UUID(candidate_id),
             Candidate.company_id == current_user.company_id,
@@ -191,7 +189,7 @@ async def get_candidate(
             location=candidate.location,
             jobId=str(latest_application.job_id) if latest_application else "",
             jobTitle=latest_application.job.title if latest_application and latest_application.job else "No job",
-            applicationDate=latest_application.created_at.isoformat() if latest_application else candidate.created_at.isoformat(),
+            applicationDate=latest_application.created_at if latest_application else candidate.created_at,
             currentStep="resume_analysis",  # Default for now
             workflowProgress=[],
             resume={
@@ -201,14 +199,14 @@ async def get_candidate(
                 "fileSize": 0,
                 "fileType": "application/pdf", 
                 "downloadUrl": candidate.resume_url or "",
-                "uploadedAt": candidate.created_at.isoformat()
+                "uploadedAt": candidate.created_at
             },
             communicationHistory=[],
             status="active",
             notes=[],
             companyId=str(candidate.company_id),
-            createdAt=candidate.created_at.isoformat(),
-            updatedAt=candidate.updated_at.isoformat()
+            createdAt=candidate.created_at,
+            updatedAt=candidate.updated_at
         )
         
     except HTTPException:
@@ -261,7 +259,7 @@ async def create_candidate(
             location=new_candidate.location,
             jobId="",
             jobTitle="",
-            applicationDate=new_candidate.created_at.isoformat(),
+            applicationDate=new_candidate.created_at,
             currentStep="new",
             workflowProgress=[],
             resume={
@@ -271,14 +269,14 @@ async def create_candidate(
                 "fileSize": 0,
                 "fileType": "",
                 "downloadUrl": "",
-                "uploadedAt": new_candidate.created_at.isoformat()
+                "uploadedAt": new_candidate.created_at
             },
             communicationHistory=[],
             status="pending",
             notes=[],
             companyId=str(new_candidate.company_id),
-            createdAt=new_candidate.created_at.isoformat(),
-            updatedAt=new_candidate.updated_at.isoformat()
+            createdAt=new_candidate.created_at,
+            updatedAt=new_candidate.updated_at
         )
         
     except HTTPException:
@@ -311,7 +309,7 @@ async def update_candidate(
         
         # Check if email is being changed and if it conflicts with another candidate
         if candidate_data.email != candidate.email:
-            existing_query = select(Candidate).where(
+            existing_query = select(Candidate.id).where(
                 Candidate.email == candidate_data.email,
                 Candidate.company_id == current_user.company_id,
                 Candidate.id != candidate.id,
@@ -340,7 +338,7 @@ async def update_candidate(
             location=candidate.location,
             jobId="",  # Will be populated when applications exist
             jobTitle="",
-            applicationDate=candidate.created_at.isoformat(),
+            applicationDate=candidate.created_at,
             currentStep="updated",
             workflowProgress=[],
             resume={
@@ -350,14 +348,14 @@ async def update_candidate(
                 "fileSize": 0,
                 "fileType": "",
                 "downloadUrl": candidate.resume_url or "",
-                "uploadedAt": candidate.created_at.isoformat()
+                "uploadedAt": candidate.created_at
             },
             communicationHistory=[],
             status="active",
             notes=[],
             companyId=str(candidate.company_id),
-            createdAt=candidate.created_at.isoformat(),
-            updatedAt=candidate.updated_at.isoformat()
+            createdAt=candidate.created_at,
+            updatedAt=candidate.updated_at
         )
         
     except HTTPException:
@@ -410,10 +408,8 @@ async def get_candidate_workflow(
     try:
         from models.candidate_workflow_execution import CandidateWorkflowExecution
         
-        # Get candidate with workflow information
-        query = select(Candidate).options(
-            selectinload(Candidate.candidate_workflows)
-        ).where(
+        # Get candidate
+        query = select(Candidate).where(
             Candidate.id == uuid.UUID(candidate_id),
             Candidate.company_id == current_user.company_id,
             Candidate.deleted_at.is_(None)
@@ -425,6 +421,15 @@ async def get_candidate_workflow(
         if not candidate:
             raise HTTPException(status_code=404, detail="Candidate not found")
         
+        # Only the latest workflow is shown, so fetch just that row
+        latest_workflow_result = await db.execute(
+            select(CandidateWorkflow)
+            .where(CandidateWorkflow.candidate_id == candidate.id)
+            .order_by(CandidateWorkflow.created_at.desc())
+            .limit(1)
+        )
+        latest_workflow = latest_workflow_result.scalar_one_or_none()
+        
         # Get workflow information
         workflow_info = {
             "has_workflow": False,
@@ -438,8 +443,7 @@ async def get_candidate_workflow(
             "steps": []
         }
         
-        if candidate.candidate_workflows:
-            latest_workflow = max(candidate.candidate_workflows, key=lambda x: x.created_at)
+        if latest_workflow:
             workflow_info["has_workflow"] = True
             
             # Get current step info from execution records
@@ -458,7 +462,7 @@ async def get_candidate_workflow(
                 else:
                     # Fallback to old method if execution record not found
                     current_step_query = select(WorkflowStepDetail).options(
-                        selectinload(WorkflowStepDetail.workflow_step)
+                        joinedload(WorkflowStepDetail.workflow_step)
                     ).where(WorkflowStepDetail.id == latest_workflow.current_step_detail_id)
                     current_step_result = await db.execute(current_step_query)
                     current_step_detail = current_step_result.scalar_one_or_none()
@@ -541,7 +545,7 @@ async def get_candidate_workflow(
                     if step_detail_ids:
                         # Get all workflow step details for this template, ordered by order_number
                         step_details_query = select(WorkflowStepDetail).options(
-                            selectinload(WorkflowStepDetail.workflow_step)
+                            joinedload(WorkflowStepDetail.workflow_step)
                         ).where(
                             WorkflowStepDetail.id.in_(step_detail_ids)
                         ).order_by(WorkflowStepDetail.order_number)
@@ -552,20 +556,26 @@ async def get_candidate_workflow(
                         if step_details:
                             total_steps = len(step_details)
                             
+                            # Load the execution records of all steps in one query
+                            execution_query = select(CandidateWorkflowExecution).where(
+                                CandidateWorkflowExecution.workflow_step_detail_id.in_([step_detail.id for step_detail in step_details]),
+                                CandidateWorkflowExecution.candidate_id == candidate.id,
+                                CandidateWorkflowExecution.job_id == latest_workflow.job_id,
+                                CandidateWorkflowExecution.is_deleted == False
+                            )
+                            execution_result = await db.execute(execution_query)
+                            executions_by_step = {
+                                execution.workflow_step_detail_id: execution
+                                for execution in execution_result.scalars().all()
+                            }
+                            
                             # Create steps array with real step names and statuses from execution records
                             workflow_info["steps"] = []
                             completed_steps = 0
                             
                             for i, step_detail in enumerate(step_details):
                                 # Get the execution record for this specific candidate and job
-                                execution_query = select(CandidateWorkflowExecution).where(
-                                    CandidateWorkflowExecution.workflow_step_detail_id == step_detail.id,
-                                    CandidateWorkflowExecution.candidate_id == candidate.id,
-                                    CandidateWorkflowExecution.job_id == latest_workflow.job_id,
-                                    CandidateWorkflowExecution.is_deleted == False
-                                )
-                                execution_result = await db.execute(execution_query)
-                                execution_record = execution_result.scalar_one_or_none()
+                                execution_record = executions_by_step.get(step_detail.id)
                                 
                                 # Use execution record data if available, otherwise fallback to step detail
                                 if execution_record:
@@ -14,14 +14,51 @@ from schemas.job import (
     JobResponse,
     JobCreate,
     JobUpdate,
-    JobListResponse
+    JobListResponse,
+    JobStatsResponse
 )
 from api.auth import get_current_user
 from models.user import Profile
 from utils.short_id import generate_unique_job_short_id
+from utils.json_response import ORJSONResponse
+from services.job_cache import job_cache
+from services.job_stats_service import job_stats_service
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
+# Columns returned by the list endpoint, in JobResponse field order
+_JOB_LIST_COLUMNS = (
+    Job.id,
+    Job.title,
+    Job.short_id,
+    Job.description,
+    Job.requirements,
+    Job.department,
+    Job.location,
+    Job.job_type,
+    Job.experience_level,
+    Job.remote_policy,
+    Job.salary_min,
+    Job.salary_max,
+    Job.salary_currency,
+    Job.status,
+    Job.workflow_template_id,
+    Job.assigned_to,
+    Job.posted_at,
+    Job.expires_at,
+    Job.is_featured,
+    Job.created_at,
+    Job.updated_at,
+)
+_JOB_LIST_KEYS = tuple(column.key for column in _JOB_LIST_COLUMNS)
+
+
+def _rows_to_dicts(rows) -> List[dict]:
+    """Zip column tuples into plain dicts without building a model per row"""
+    keys = _JOB_LIST_KEYS
+    return [dict(zip(keys, row)) for row in rows]
+
+
 @router.get("", response_model=JobListResponse)
 @router.get("/", response_model=JobListResponse)
 async def get_jobs(
@@ -35,62 +72,43 @@ async def get_jobs(
 ):
     """Get all jobs for the company with pagination and filtering"""
     try:
-        # Base query - filter by company
-        base_query = select(Job).where(Job.company_id == current_user.company_id)
+        # Filters - scoped to the company
+        filters = [Job.company_id == current_user.company_id]
         
-        # Apply filters
         if search:
-            base_query = base_query.where(
+            filters.append(
                 Job.title.ilike(f"%{search}%") | 
                 Job.description.ilike(f"%{search}%")
             )
         
         if status:
-            base_query = base_query.where(Job.status == status)
+            filters.append(Job.status == status)
             
         if department:
-            base_query = base_query.where(Job.department.ilike(f"%{department}%"))
+            filters.append(Job.department.ilike(f"%{department}%"))
         
         # Get total count
-        count_query = select(func.count()).select_from(base_query.subquery())
+        count_query = select(func.count()).select_from(Job).where(*filters)
         total_result = await db.execute(count_query)
         total = total_result.scalar()
         
-        # Get jobs with pagination
-        jobs_query = base_query.order_by(Job.created_at.desc()).offset(skip).limit(limit)
+        # Fetch plain column tuples instead of ORM instances and encode them directly
+        jobs_query = (
+            select(*_JOB_LIST_COLUMNS)
+            .where(*filters)
+            .order_by(Job.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
         result = await db.execute(jobs_query)
-        jobs = result.scalars().all()
+        rows = result.all()
         
-        return JobListResponse(
-            jobs=[
-                JobResponse(
-                    id=job.id,
-                    title=job.title,
-                    short_id=job.short_id,
-                    description=job.description,
-                    requirements=job.requirements,
-                    department=job.department,
-                    location=job.location,
-                    job_type=job.job_type,
-                    experience_level=job.experience_level,
-                    remote_policy=job.remote_policy,
-                    salary_min=job.salary_min,
-                    salary_max=job.salary_max,
-                    salary_currency=job.salary_currency,
-                    status=job.status,
-                    workflow_template_id=job.workflow_template_id,
-                    posted_at=job.posted_at,
-                    expires_at=job.expires_at,
-                    is_featured=job.is_featured,
-                    created_at=job.created_at,
-                    updated_at=job.updated_at
-                )
-                for job in jobs
-            ],
-            total=total,
-            skip=skip,
-            limit=limit
-        )
+        return ORJSONResponse({
+            "jobs": _rows_to_dicts(rows),
+            "total": total,
+            "skip": skip,
+            "limit": limit
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -98,6 +116,21 @@ async def get_jobs(
             detail=f"Failed to fetch jobs: {str(e)}"
         )
 
+@router.get("/stats", response_model=JobStatsResponse)
+async def get_job_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: Profile = Depends(get_current_user)
+):
+    """Get job counts by status and type for the company dashboard"""
+    try:
+        return await job_stats_service.get_counts(db, current_user.company_id)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch job stats: {str(e)}"
+        )
+
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: UUID,
@@ -106,6 +139,19 @@ async def get_job(
 ):
     """Get a specific job by ID"""
     try:
+        # The cached response is only served if the row hasn't changed since;
+        # reading updated_at is a primary-key lookup without building the response
+        updated_at = await db.scalar(
+            select(Job.updated_at).where(
+                Job.id == job_id,
+                Job.company_id == current_user.company_id
+            )
+        )
+        if updated_at is not None:
+            cached = job_cache.get_by_id(job_id, updated_at)
+            if cached and cached[0] == current_user.company_id:
+                return cached[1]
+        
         result = await db.execute(
             select(Job).where(
                 Job.id == job_id,
@@ -120,7 +166,7 @@ async def get_job(
                 detail="Job not found"
             )
         
-        return JobResponse(
+        job_response = JobResponse(
             id=job.id,
             title=job.title,
             short_id=job.short_id,
@@ -142,6 +188,8 @@ async def get_job(
             created_at=job.created_at,
             updated_at=job.updated_at
         )
+        job_cache.set_by_id(job.id, job.company_id, job.updated_at, job_response)
+        return job_response
         
     except HTTPException:
         raise
@@ -163,7 +211,7 @@ async def create_job(
         # Validate workflow template if provided
         if job_data.workflow_template_id:
             wf_result = await db.execute(
-                select(WorkflowTemplate).where(
+                select(WorkflowTemplate.id).where(
                     WorkflowTemplate.id == job_data.workflow_template_id,
                     WorkflowTemplate.is_deleted == False
                 )
@@ -204,6 +252,7 @@ async def create_job(
         db.add(new_job)
         await db.commit()
         await db.refresh(new_job)
+        job_stats_service.schedule_refresh()
         
         return JobResponse(
             id=new_job.id,
@@ -264,7 +313,7 @@ async def update_job(
         # Validate workflow template if provided
         if job_data.workflow_template_id:
             wf_result = await db.execute(
-                select(WorkflowTemplate).where(
+                select(WorkflowTemplate.id).where(
                     WorkflowTemplate.id == job_data.workflow_template_id,
                     WorkflowTemplate.is_deleted == False
                 )
@@ -282,6 +331,8 @@ async def update_job(
         
         await db.commit()
         await db.refresh(job)
+        job_cache.invalidate(job.id, job.short_id)
+        job_stats_service.schedule_refresh()
         
         return JobResponse(
             id=job.id,
@@ -341,6 +392,8 @@ async def delete_job(
         # Soft delete by setting status to closed
         job.status = "closed"
         await db.commit()
+        job_cache.invalidate(job.id, job.short_id)
+        job_stats_service.schedule_refresh()
         
         return {"message": "Job deleted successfully"}
         
@@ -15,13 +15,10 @@ from schemas.users import (
     UserCreate, UserUpdate, UserResponse, UserListResponse,
     PasswordReset, PasswordChange
 )
-from services.auth_service import AuthService
+from services.auth_service import auth_service
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
-# Initialize auth service for password hashing
-auth_service = AuthService()
-
 def generate_temp_password(length: int = 12) -> str:
     """Generate a secure temporary password"""
     alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
@@ -122,7 +119,7 @@ async def create_user(
     
     # Check if email already exists in the company
     existing_user = await db.execute(
-        select(Profile).where(
+        select(Profile.id).where(
             and_(
                 Profile.email == user_data.email,
                 Profile.company_id == current_user.company_id
@@ -148,7 +145,7 @@ async def create_user(
     
     # Generate password if not provided
     password = user_data.password or generate_temp_password()
-    password_hash = auth_service.get_password_hash(password)
+    password_hash = await auth_service.aget_password_hash(password)
     
     # Create new user
     new_user = Profile(
@@ -303,7 +300,7 @@ async def update_user(
         if user_data.email is not None:
             # Check email uniqueness
             existing = await db.execute(
-                select(Profile).where(
+                select(Profile.id).where(
                     and_(
                         Profile.email == user_data.email,
                         Profile.company_id == current_user.company_id,
@@ -321,7 +318,7 @@ async def update_user(
         if user_data.role_id is not None:
             # Verify role exists
             role_result = await db.execute(
-                select(UserRole).where(UserRole.id == user_data.role_id)
+                select(UserRole.id).where(UserRole.id == user_data.role_id)
             )
             if not role_result.scalar_one_or_none():
                 raise HTTPException(
@@ -392,7 +389,7 @@ async def reset_user_password(
     
     # Generate new temporary password
     new_password = generate_temp_password()
-    user.password_hash = auth_service.get_password_hash(new_password)
+    user.password_hash = await auth_service.aget_password_hash(new_password)
     user.must_change_password = True
     user.updated_at = datetime.utcnow()
     
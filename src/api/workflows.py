@@ -1,25 +1,31 @@
 """
 Workflow API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
+from datetime import datetime
 
 from core.database import get_db
-from models.workflow import WorkflowStep, WorkflowTemplate, WorkflowStepDetail, CandidateWorkflow
+from models.workflow import WorkflowStep, WorkflowTemplate, WorkflowTemplateStep, WorkflowStepDetail, CandidateWorkflow
 from schemas.workflow import (
     WorkflowStepResponse, 
+    WorkflowStepListAdapter,
     WorkflowTemplateResponse, 
     WorkflowTemplateCreate,
     WorkflowTemplateCreateWithSteps,
     WorkflowTemplatePopulated,
+    WorkflowTemplatePopulatedAdapter,
     WorkflowStepDetailPopulated,
     WorkflowStepDetailResponse,
-    CandidateWorkflowResponse
+    CandidateWorkflowResponse,
+    StepDetailStatus,
+    StepType
 )
 from api.auth import get_current_user
 from models.user import Profile
+from services.workflow_template_cache import workflow_template_cache
 
 router = APIRouter(prefix="/api/workflows", tags=["workflows"])
 
@@ -36,19 +42,8 @@ async def get_workflow_steps(
         )
         workflow_steps = result.scalars().all()
         
-        return [
-            WorkflowStepResponse(
-                id=step.id,
-                name=step.name,
-                display_name=step.display_name,
-                description=step.description,
-                step_type=step.step_type,
-                actions=step.actions,
-                created_at=step.created_at,
-                updated_at=step.updated_at
-            )
-            for step in workflow_steps
-        ]
+        steps = WorkflowStepListAdapter.validate_python(workflow_steps, from_attributes=True)
+        return Response(content=WorkflowStepListAdapter.dump_json(steps), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(
@@ -72,28 +67,41 @@ async def get_workflow_templates(
         )
         templates = result.scalars().all()
         
-        populated_templates = []
+        # Reuse the serialized JSON of templates that haven't changed since they were cached
+        template_json = {
+            template.id: workflow_template_cache.get_populated_json(template.id, template.updated_at)
+            for template in templates
+        }
+        stale_templates = [template for template in templates if template_json[template.id] is None]
+        
+        # Fetch the ordered step details of every stale template in one query through the join table
+        step_rows_by_template = {}
+        if stale_templates:
+            step_detail_result = await db.execute(
+                select(WorkflowTemplateStep.template_id, WorkflowStepDetail, WorkflowStep)
+                .join(WorkflowStepDetail, WorkflowTemplateStep.step_detail_id == WorkflowStepDetail.id)
+                .join(WorkflowStep, WorkflowStepDetail.workflow_step_id == WorkflowStep.id)
+                .where(
+                    WorkflowTemplateStep.template_id.in_([template.id for template in stale_templates]),
+                    WorkflowStepDetail.is_deleted == False,
+                    WorkflowStep.is_deleted == False
+                )
+                .order_by(WorkflowTemplateStep.template_id, WorkflowStepDetail.order_number)
+            )
+            for template_id, step_detail, workflow_step in step_detail_result:
+                step_rows_by_template.setdefault(template_id, []).append((step_detail, workflow_step))
         
-        for template in templates:
+        for template in stale_templates:
             # Get step details for this template
             step_details = []
             
             if template.steps_execution_id:
-                # Fetch WorkflowStepDetail records
-                step_detail_result = await db.execute(
-                    select(WorkflowStepDetail, WorkflowStep)
-                    .join(WorkflowStep, WorkflowStepDetail.workflow_step_id == WorkflowStep.id)
-                    .where(
-                        WorkflowStepDetail.id.in_(template.steps_execution_id),
-                        WorkflowStepDetail.is_deleted == False,
-                        WorkflowStep.is_deleted == False
-                    )
-                    .order_by(WorkflowStepDetail.order_number)
-                )
+                step_detail_rows = step_rows_by_template.get(template.id, [])
                 
-                for step_detail, workflow_step in step_detail_result:
+                for step_detail, workflow_step in step_detail_rows:
+                    # Rows come straight from the database, so skip re-validation here
                     step_details.append(
-                        WorkflowStepDetailPopulated(
+                        WorkflowStepDetailPopulated.model_construct(
                             id=step_detail.id,
                             workflow_step_id=step_detail.workflow_step_id,
                             delay_in_seconds=step_detail.delay_in_seconds,
@@ -101,16 +109,16 @@ async def get_workflow_templates(
                             required_human_approval=step_detail.required_human_approval,
                             number_of_approvals_needed=step_detail.number_of_approvals_needed,
                             approvers=step_detail.approvers or [],  # Include approvers list
-                            status=step_detail.status,
+                            status=StepDetailStatus(step_detail.status),
                             order_number=step_detail.order_number,
                             created_at=step_detail.created_at,
                             updated_at=step_detail.updated_at,
-                            workflow_step=WorkflowStepResponse(
+                            workflow_step=WorkflowStepResponse.model_construct(
                                 id=workflow_step.id,
                                 name=workflow_step.name,
                                 display_name=workflow_step.display_name,
                                 description=workflow_step.description,
-                                step_type=workflow_step.step_type,
+                                step_type=StepType(workflow_step.step_type),
                                 actions=workflow_step.actions,
                                 created_at=workflow_step.created_at,
                                 updated_at=workflow_step.updated_at
@@ -118,20 +126,25 @@ async def get_workflow_templates(
                         )
                     )
             
-            populated_templates.append(
-                WorkflowTemplatePopulated(
-                    id=template.id,
-                    name=template.name,
-                    description=template.description,
-                    category=template.category,
-                    steps_execution_id=template.steps_execution_id,
-                    created_at=template.created_at,
-                    updated_at=template.updated_at,
-                    step_details=step_details
-                )
+            populated_template = WorkflowTemplatePopulated.model_construct(
+                id=template.id,
+                name=template.name,
+                description=template.description,
+                category=template.category,
+                steps_execution_id=template.steps_execution_id,
+                created_at=template.created_at,
+                updated_at=template.updated_at,
+                step_details=step_details
             )
+            payload = WorkflowTemplatePopulatedAdapter.dump_json(populated_template)
+            workflow_template_cache.set_populated_json(template.id, template.updated_at, payload)
+            template_json[template.id] = payload
         
-        return populated_templates
+        # Stitch the per-template JSON together in listing order
+        return Response(
+            content=b"[" + b",".join(template_json[template.id] for template in templates) + b"]",
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(
@@ -268,6 +281,8 @@ async def update_workflow_template(
                 .where(WorkflowStepDetail.id.in_(template.steps_execution_id))
                 .values(is_deleted=True)
             )
+            # A bulk UPDATE skips mapper events; bump updated_at so cached steps reload
+            template.updated_at = datetime.utcnow()
         
         # Create new step details
         step_detail_ids = []
@@ -347,6 +362,8 @@ async def delete_workflow_template(
                 .where(WorkflowStepDetail.id.in_(template.steps_execution_id))
                 .values(is_deleted=True)
             )
+            # A bulk UPDATE skips mapper events; bump updated_at so cached steps reload
+            template.updated_at = datetime.utcnow()
         
         # Soft delete template
         template.is_deleted = True
@@ -6,12 +6,21 @@ import os
 class Settings(BaseSettings):
     # Database Configuration
     DATABASE_URL: str = Field(..., description="Complete PostgreSQL connection URL")
+    # Defaults suit a single worker behind Railway's proxy; raise the pool through env for bigger deployments
+    DB_POOL_SIZE: int = Field(default=5, description="Persistent connections kept in the pool")
+    DB_MAX_OVERFLOW: int = Field(default=10, description="Extra connections allowed under burst load")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, description="Seconds to wait for a free pooled connection")
+    DB_POOL_RECYCLE: int = Field(default=300, description="Seconds before a pooled connection is replaced")
+    DB_POOL_PRE_PING: bool = Field(default=True, description="Ping connections on checkout")
+    DB_USE_PGBOUNCER: bool = Field(default=False, description="PgBouncer (transaction mode) does the pooling")
     
     # Security
     SECRET_KEY: str = Field(default="your-secret-key-change-in-production", description="JWT secret key")
     ALGORITHM: str = Field(default="HS256", description="JWT algorithm")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=180, description="Access token expiration")
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7, description="Refresh token expiration")
+    PASSWORD_HASH_SCHEME: str = Field(default="argon2", description="Scheme for new password hashes: argon2 or bcrypt")
+    BCRYPT_ROUNDS: int = Field(default=12, description="bcrypt cost factor for new bcrypt hashes")
     
     # Application Settings
     DEBUG: bool = Field(default=True, description="Debug mode")
@@ -1,5 +1,8 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 from typing import AsyncGenerator
+from uuid import uuid4
 import logging
 
 from .config import settings
@@ -8,14 +11,33 @@ logger = logging.getLogger(__name__)
 
 print(f"Database URL: {settings.async_database_url[:50]}...")
 
+if settings.DB_USE_PGBOUNCER:
+    # PgBouncer owns the pool. Under transaction pooling a named prepared statement
+    # can land on a server connection that already has one with the same name, so
+    # disable both caches and give every statement a unique name
+    engine_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    engine_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": True,  # Reuse the most recent connection so idle ones can expire
+    }
+
 # Create async engine for Railway PostgreSQL
 engine = create_async_engine(
     settings.async_database_url,  # Use async version
     echo=False,  # Disable SQL query logging for performance
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Verify connections before use
-    pool_recycle=300,  # Recycle connections every 5 minutes
+    **engine_options
 )
 
 # Create async session factory
@@ -36,6 +58,10 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+def constraint_name(error: IntegrityError) -> str:
+    """Name of the constraint behind an asyncpg IntegrityError, or '' if unknown"""
+    return getattr(error.orig.__cause__, "constraint_name", None) or ""
+
 async def check_database_connection():
     """Check if database connection works"""
     print(f"🔍 Railway PostgreSQL Connection Test")
@@ -20,7 +20,7 @@ async def create_all_tables():
         from src.models.user import Profile, UserRole, Company
         from src.models.gmail_webhook import GmailWatch, EmailProcessingLog
         from src.models.job import Job
-        from src.models.workflow import WorkflowTemplate, WorkflowStep, WorkflowStepDetail, CandidateWorkflow
+        from src.models.workflow import WorkflowTemplate, WorkflowTemplateStep, WorkflowStep, WorkflowStepDetail, CandidateWorkflow, WorkflowEvent
         from src.models.approval import WorkflowApprovalRequest
         from src.models.candidate_workflow_execution import CandidateWorkflowExecution
         from src.models.candidate import Candidate, Application
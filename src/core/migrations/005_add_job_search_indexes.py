@@ -0,0 +1,78 @@
+"""
+Migration: Add indexes on jobs filter columns
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+# Index name -> definition (matches Job.__table_args__ and index=True columns)
+JOB_INDEXES = {
+    'ix_jobs_status': "CREATE INDEX ix_jobs_status ON jobs (status)",
+    'ix_jobs_job_type': "CREATE INDEX ix_jobs_job_type ON jobs (job_type)",
+    'ix_jobs_experience_level': "CREATE INDEX ix_jobs_experience_level ON jobs (experience_level)",
+    'ix_jobs_remote_policy': "CREATE INDEX ix_jobs_remote_policy ON jobs (remote_policy)",
+    'ix_jobs_company_status': "CREATE INDEX ix_jobs_company_status ON jobs (company_id, status)",
+    'ix_jobs_status_posted': "CREATE INDEX ix_jobs_status_posted ON jobs (status, posted_at)",
+    'ix_jobs_active_company': "CREATE INDEX ix_jobs_active_company ON jobs (company_id) WHERE status = 'active'",
+}
+
+async def run_migration():
+    """Add indexes on the columns used to filter job listings"""
+    
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+    
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    async with async_session() as session:
+        try:
+            print("🔄 Adding indexes to jobs table...")
+            
+            # Check which indexes already exist
+            result = await session.execute(text("""
+                SELECT indexname 
+                FROM pg_indexes 
+                WHERE tablename = 'jobs'
+            """))
+            existing_indexes = {row[0] for row in result.fetchall()}
+            
+            missing_indexes = [name for name in JOB_INDEXES if name not in existing_indexes]
+            
+            if not missing_indexes:
+                print("✅ All job indexes already exist")
+                return
+            
+            for index_name in missing_indexes:
+                print(f"➕ Creating index {index_name}...")
+                await session.execute(text(JOB_INDEXES[index_name]))
+            
+            print("✅ Successfully added indexes to jobs table")
+            
+            # Commit the transaction
+            await session.commit()
+            
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
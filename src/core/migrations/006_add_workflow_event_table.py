@@ -0,0 +1,105 @@
+"""
+Migration: Add append-only workflow_event table for candidate workflow logs
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Create workflow_event, add last_event_summary and backfill from execution_log"""
+    
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+    
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    async with async_session() as session:
+        try:
+            print("🔄 Adding workflow_event table...")
+            
+            # Check if the table already exists
+            result = await session.execute(text("""
+                SELECT table_name 
+                FROM information_schema.tables 
+                WHERE table_name = 'workflow_event'
+            """))
+            
+            if result.fetchone():
+                print("✅ workflow_event table already exists")
+                return
+            
+            await session.execute(text("""
+                CREATE TABLE workflow_event (
+                    id UUID PRIMARY KEY,
+                    candidate_workflow_id UUID NOT NULL REFERENCES candidate_workflow(id),
+                    seq BIGINT GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+                    event_type TEXT NOT NULL,
+                    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+            
+            print("➕ Creating ix_workflow_event_workflow_seq index...")
+            await session.execute(text("""
+                CREATE INDEX ix_workflow_event_workflow_seq 
+                ON workflow_event (candidate_workflow_id, seq)
+            """))
+            
+            print("➕ Adding last_event_summary column to candidate_workflow...")
+            await session.execute(text("""
+                ALTER TABLE candidate_workflow 
+                ADD COLUMN IF NOT EXISTS last_event_summary JSONB
+            """))
+            
+            # Backfill events from the existing execution_log arrays, preserving order
+            print("📝 Backfilling workflow events from execution_log...")
+            await session.execute(text("""
+                INSERT INTO workflow_event (id, candidate_workflow_id, event_type, payload, created_at, updated_at)
+                SELECT gen_random_uuid(),
+                       cw.id,
+                       COALESCE(entry.value->>'event', 'step_executed'),
+                       entry.value,
+                       cw.created_at,
+                       cw.created_at
+                FROM candidate_workflow cw
+                CROSS JOIN LATERAL jsonb_array_elements(cw.execution_log) WITH ORDINALITY AS entry(value, position)
+                ORDER BY cw.id, entry.position
+            """))
+            
+            await session.execute(text("""
+                UPDATE candidate_workflow 
+                SET last_event_summary = execution_log -> -1 
+                WHERE jsonb_array_length(execution_log) > 0
+            """))
+            
+            print("✅ Successfully added workflow_event table")
+            
+            # Commit the transaction
+            await session.commit()
+            
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,74 @@
+"""
+Migration: Add GIN indexes on workflow JSONB/array columns
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+# Index name -> definition (matches the __table_args__ in models/workflow.py)
+WORKFLOW_GIN_INDEXES = {
+    'ix_workflow_template_steps_gin': "CREATE INDEX ix_workflow_template_steps_gin ON workflow_template USING gin (steps_execution_id)",
+    'ix_workflow_step_actions_gin': "CREATE INDEX ix_workflow_step_actions_gin ON workflow_step USING gin (actions jsonb_path_ops)",
+    'ix_workflow_step_detail_approvers_gin': "CREATE INDEX ix_workflow_step_detail_approvers_gin ON workflow_step_detail USING gin (approvers jsonb_path_ops)",
+}
+
+async def run_migration():
+    """Add GIN indexes so containment lookups on workflow columns use an index"""
+    
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+    
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    async with async_session() as session:
+        try:
+            print("🔄 Adding GIN indexes to workflow tables...")
+            
+            # Check which indexes already exist
+            result = await session.execute(text("""
+                SELECT indexname 
+                FROM pg_indexes 
+                WHERE tablename IN ('workflow_template', 'workflow_step', 'workflow_step_detail')
+            """))
+            existing_indexes = {row[0] for row in result.fetchall()}
+            
+            missing_indexes = [name for name in WORKFLOW_GIN_INDEXES if name not in existing_indexes]
+            
+            if not missing_indexes:
+                print("✅ All workflow GIN indexes already exist")
+                return
+            
+            for index_name in missing_indexes:
+                print(f"➕ Creating index {index_name}...")
+                await session.execute(text(WORKFLOW_GIN_INDEXES[index_name]))
+            
+            print("✅ Successfully added GIN indexes to workflow tables")
+            
+            # Commit the transaction
+            await session.commit()
+            
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,77 @@
+"""
+Migration: Add partial indexes on live (is_deleted = false) rows
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+# Index name -> definition (matches the models' __table_args__)
+PARTIAL_INDEXES = {
+    'ix_candidate_workflow_candidate_active': "CREATE INDEX ix_candidate_workflow_candidate_active ON candidate_workflow (candidate_id) WHERE is_deleted = false",
+    'ix_candidate_workflow_job_active': "CREATE INDEX ix_candidate_workflow_job_active ON candidate_workflow (job_id) WHERE is_deleted = false",
+    'ix_candidate_workflow_template_active': "CREATE INDEX ix_candidate_workflow_template_active ON candidate_workflow (workflow_template_id) WHERE is_deleted = false",
+    'ix_workflow_step_detail_step_active': "CREATE INDEX ix_workflow_step_detail_step_active ON workflow_step_detail (workflow_step_id) WHERE is_deleted = false",
+    'ix_workflow_template_company_name_active': "CREATE INDEX ix_workflow_template_company_name_active ON workflow_template (company_id, name) WHERE is_deleted = false",
+    'ix_cwe_candidate_job_step_active': "CREATE INDEX ix_cwe_candidate_job_step_active ON candidate_workflow_executions (candidate_id, job_id, workflow_step_detail_id) WHERE is_deleted = false",
+}
+
+async def run_migration():
+    """Add partial indexes that only cover non-deleted rows"""
+    
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+    
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    async with async_session() as session:
+        try:
+            print("🔄 Adding partial indexes for soft-deleted tables...")
+            
+            # Check which indexes already exist
+            result = await session.execute(text("""
+                SELECT indexname 
+                FROM pg_indexes 
+                WHERE tablename IN ('candidate_workflow', 'workflow_step_detail', 'workflow_template', 'candidate_workflow_executions')
+            """))
+            existing_indexes = {row[0] for row in result.fetchall()}
+            
+            missing_indexes = [name for name in PARTIAL_INDEXES if name not in existing_indexes]
+            
+            if not missing_indexes:
+                print("✅ All partial indexes already exist")
+                return
+            
+            for index_name in missing_indexes:
+                print(f"➕ Creating index {index_name}...")
+                await session.execute(text(PARTIAL_INDEXES[index_name]))
+            
+            print("✅ Successfully added partial indexes")
+            
+            # Commit the transaction
+            await session.commit()
+            
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
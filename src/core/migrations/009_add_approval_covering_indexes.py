@@ -0,0 +1,81 @@
+"""
+Migration: Add covering indexes for approval request listings
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+# Index name -> definition (matches the __table_args__ in models/approval.py)
+APPROVAL_INDEXES = {
+    'ix_war_approver_status_requested': """
+        CREATE INDEX ix_war_approver_status_requested 
+        ON workflow_approval_requests (approver_user_id, status, requested_at) 
+        INCLUDE (candidate_workflow_id, workflow_step_detail_id)
+    """,
+    'ix_workflow_approvals_request': """
+        CREATE INDEX ix_workflow_approvals_request 
+        ON workflow_approvals (approval_request_id) 
+        INCLUDE (decision)
+    """,
+}
+
+async def run_migration():
+    """Add covering indexes used by the pending and history approval listings"""
+    
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+    
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    async with async_session() as session:
+        try:
+            print("🔄 Adding covering indexes to approval tables...")
+            
+            # Check which indexes already exist
+            result = await session.execute(text("""
+                SELECT indexname 
+                FROM pg_indexes 
+                WHERE tablename IN ('workflow_approval_requests', 'workflow_approvals')
+            """))
+            existing_indexes = {row[0] for row in result.fetchall()}
+            
+            missing_indexes = [name for name in APPROVAL_INDEXES if name not in existing_indexes]
+            
+            if not missing_indexes:
+                print("✅ All approval indexes already exist")
+                return
+            
+            for index_name in missing_indexes:
+                print(f"➕ Creating index {index_name}...")
+                await session.execute(text(APPROVAL_INDEXES[index_name]))
+            
+            print("✅ Successfully added approval covering indexes")
+            
+            # Commit the transaction
+            await session.commit()
+            
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
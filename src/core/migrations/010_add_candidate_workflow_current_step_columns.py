@@ -0,0 +1,85 @@
+"""
+Migration: Denormalize current step fields onto candidate_workflow
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Add current_* step columns to candidate_workflow and backfill them"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Adding current step columns to candidate_workflow...")
+
+            columns = {
+                'current_order_number': 'INTEGER',
+                'current_step_type': 'TEXT',
+                'current_required_human_approval': 'BOOLEAN',
+                'current_approvers': 'JSONB',
+            }
+
+            for column_name, column_type in columns.items():
+                print(f"➕ Adding {column_name} column...")
+                await session.execute(text(f"""
+                    ALTER TABLE candidate_workflow
+                    ADD COLUMN IF NOT EXISTS {column_name} {column_type}
+                """))
+
+            # Backfill (and on re-runs, reconcile) from the current step detail
+            print("📝 Backfilling current step columns from workflow_step_detail...")
+            await session.execute(text("""
+                UPDATE candidate_workflow cw
+                SET current_order_number = wsd.order_number,
+                    current_step_type = ws.step_type,
+                    current_required_human_approval = wsd.required_human_approval,
+                    current_approvers = wsd.approvers
+                FROM workflow_step_detail wsd
+                JOIN workflow_step ws ON ws.id = wsd.workflow_step_id
+                WHERE wsd.id = cw.current_step_detail_id
+            """))
+
+            await session.execute(text("""
+                UPDATE candidate_workflow
+                SET current_order_number = NULL,
+                    current_step_type = NULL,
+                    current_required_human_approval = NULL,
+                    current_approvers = NULL
+                WHERE current_step_detail_id IS NULL
+            """))
+
+            print("✅ Successfully added current step columns")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
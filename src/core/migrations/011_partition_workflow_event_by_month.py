@@ -0,0 +1,202 @@
+"""
+Migration: Range-partition workflow_event by created_at month
+Date: 2025-08-24
+
+Safe to re-run: on an already partitioned table it only refreshes the
+workflow_event_add_partition() function and adds the coming months. After that
+the app's WorkflowEventPartitionService keeps partitions created ahead of time.
+"""
+
+import asyncio
+import os
+from datetime import date
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+# Number of future months to keep partitions for
+MONTHS_AHEAD = 3
+
+
+def _add_months(month_start: date, months: int) -> date:
+    month_index = month_start.month - 1 + months
+    return date(month_start.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+# Same function as models.workflow.WORKFLOW_EVENT_ADD_PARTITION_FUNCTION: adds one
+# month's partition, first moving any of that month's rows out of the default partition
+ADD_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION workflow_event_add_partition(month_start date) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    range_start date := CAST(date_trunc('month', month_start) AS date);
+    range_end date := CAST(date_trunc('month', month_start) + interval '1 month' AS date);
+    partition_name text := 'workflow_event_' || to_char(range_start, 'YYYY_MM');
+    has_rows boolean := false;
+BEGIN
+    -- Serializes concurrent callers (e.g. workers starting together) until commit
+    PERFORM pg_advisory_xact_lock(hashtext('workflow_event_add_partition'));
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    IF to_regclass('workflow_event_default') IS NOT NULL THEN
+        EXECUTE 'SELECT EXISTS (SELECT 1 FROM workflow_event_default'
+            || ' WHERE created_at >= ' || quote_literal(range_start)
+            || ' AND created_at < ' || quote_literal(range_end) || ')'
+            INTO has_rows;
+    END IF;
+    IF NOT has_rows THEN
+        EXECUTE 'CREATE TABLE ' || quote_ident(partition_name)
+            || ' PARTITION OF workflow_event FOR VALUES FROM ('
+            || quote_literal(range_start) || ') TO (' || quote_literal(range_end) || ')';
+        RETURN;
+    END IF;
+    -- The default partition already holds rows for this month, which would make
+    -- CREATE ... PARTITION OF fail: detach it while they are moved across
+    ALTER TABLE workflow_event DETACH PARTITION workflow_event_default;
+    EXECUTE 'CREATE TABLE ' || quote_ident(partition_name)
+        || ' PARTITION OF workflow_event FOR VALUES FROM ('
+        || quote_literal(range_start) || ') TO (' || quote_literal(range_end) || ')';
+    EXECUTE 'WITH moved AS (DELETE FROM workflow_event_default'
+        || ' WHERE created_at >= ' || quote_literal(range_start)
+        || ' AND created_at < ' || quote_literal(range_end)
+        || ' RETURNING *) INSERT INTO ' || quote_ident(partition_name) || ' SELECT * FROM moved';
+    ALTER TABLE workflow_event ATTACH PARTITION workflow_event_default DEFAULT;
+END;
+$$
+"""
+
+
+async def _create_monthly_partitions(session, first_month: date, last_month: date, commit_each: bool = False):
+    month = first_month
+    while month <= last_month:
+        print(f"➕ Ensuring partition workflow_event_{month:%Y_%m}...")
+        await session.execute(text("SELECT workflow_event_add_partition(:month)"), {"month": month})
+        if commit_each:
+            # One transaction per month, so one failure keeps the months before it
+            await session.commit()
+        month = _add_months(month, 1)
+
+
+async def run_migration():
+    """Convert workflow_event to a monthly range-partitioned table"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            this_month = date.today().replace(day=1)
+            last_month = _add_months(this_month, MONTHS_AHEAD)
+
+            # Check if workflow_event is already partitioned
+            result = await session.execute(text("""
+                SELECT 1
+                FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = 'workflow_event'
+            """))
+
+            if result.fetchone():
+                print("✅ workflow_event is already partitioned - adding upcoming partitions")
+                await session.execute(text(ADD_PARTITION_FUNCTION))
+                await session.commit()
+                await _create_monthly_partitions(session, this_month, last_month, commit_each=True)
+                return
+
+            print("🔄 Partitioning workflow_event by month...")
+
+            # Move the existing table (and names that would clash) out of the way
+            await session.execute(text("ALTER TABLE workflow_event RENAME TO workflow_event_unpartitioned"))
+            await session.execute(text("""
+                ALTER TABLE workflow_event_unpartitioned
+                RENAME CONSTRAINT workflow_event_pkey TO workflow_event_unpartitioned_pkey
+            """))
+            await session.execute(text("""
+                ALTER INDEX IF EXISTS ix_workflow_event_workflow_seq
+                RENAME TO ix_workflow_event_unpartitioned_seq
+            """))
+
+            await session.execute(text("""
+                CREATE TABLE workflow_event (
+                    id UUID NOT NULL,
+                    candidate_workflow_id UUID NOT NULL REFERENCES candidate_workflow(id),
+                    seq BIGINT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (id, created_at)
+                ) PARTITION BY RANGE (created_at)
+            """))
+
+            # Partitions covering the existing rows through the coming months
+            result = await session.execute(text("SELECT MIN(created_at) FROM workflow_event_unpartitioned"))
+            oldest = result.scalar_one_or_none()
+            first_month = oldest.date().replace(day=1) if oldest else this_month
+            await session.execute(text("""
+                CREATE TABLE IF NOT EXISTS workflow_event_default
+                PARTITION OF workflow_event DEFAULT
+            """))
+            await session.execute(text(ADD_PARTITION_FUNCTION))
+            await _create_monthly_partitions(session, min(first_month, this_month), last_month)
+
+            print("📝 Copying existing workflow events...")
+            await session.execute(text("""
+                INSERT INTO workflow_event (id, candidate_workflow_id, seq, event_type, payload, created_at, updated_at)
+                SELECT id, candidate_workflow_id, seq, event_type, payload, created_at, updated_at
+                FROM workflow_event_unpartitioned
+            """))
+
+            result = await session.execute(text("SELECT COALESCE(MAX(seq), 0) FROM workflow_event_unpartitioned"))
+            next_seq = result.scalar_one() + 1
+
+            # Dropping the old table also drops its identity sequence
+            await session.execute(text("DROP TABLE workflow_event_unpartitioned"))
+
+            print("➕ Creating workflow_event_seq_seq sequence...")
+            await session.execute(text(f"CREATE SEQUENCE workflow_event_seq_seq START {next_seq}"))
+            await session.execute(text("""
+                ALTER TABLE workflow_event
+                ALTER COLUMN seq SET DEFAULT nextval('workflow_event_seq_seq')
+            """))
+            await session.execute(text("ALTER SEQUENCE workflow_event_seq_seq OWNED BY workflow_event.seq"))
+
+            print("➕ Creating workflow_event indexes...")
+            await session.execute(text("""
+                CREATE INDEX ix_workflow_event_workflow_seq
+                ON workflow_event (candidate_workflow_id, seq)
+            """))
+            await session.execute(text("""
+                CREATE INDEX ix_workflow_event_created_brin
+                ON workflow_event USING brin (created_at)
+            """))
+
+            print("✅ Successfully partitioned workflow_event")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
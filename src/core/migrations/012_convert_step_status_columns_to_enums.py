@@ -0,0 +1,136 @@
+"""
+Migration: Convert step status text columns to Postgres ENUM types
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Create step status enum types, convert the columns and add check constraints"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    # table -> (column, enum type, allowed values, column default)
+    status_columns = {
+        'workflow_step_detail': ('status', 'step_detail_status', ('awaiting', 'finished', 'rejected'), 'awaiting'),
+        'candidate_workflow_executions': ('execution_status', 'execution_status', ('pending', 'running', 'finished', 'failed', 'rejected'), 'pending'),
+    }
+
+    # Values older code wrote that have an enum equivalent, per table
+    legacy_values = {
+        'candidate_workflow_executions': {
+            'in_progress': 'running',
+            'approved': 'finished',
+            'completed': 'finished',
+            'success': 'finished',
+        },
+    }
+
+    check_constraints = {
+        'ck_workflow_step_detail_order_number_positive': ('workflow_step_detail', 'order_number > 0'),
+        'ck_cwe_order_number_positive': ('candidate_workflow_executions', 'order_number > 0'),
+    }
+
+    async with async_session() as session:
+        try:
+            print("🔄 Converting step status columns to enums...")
+
+            for table_name, (column_name, type_name, values, default) in status_columns.items():
+                # Skip columns that already use the enum type
+                result = await session.execute(text("""
+                    SELECT udt_name
+                    FROM information_schema.columns
+                    WHERE table_name = :table_name AND column_name = :column_name
+                """), {"table_name": table_name, "column_name": column_name})
+                current_type = result.scalar_one_or_none()
+
+                if current_type == type_name:
+                    print(f"✅ {table_name}.{column_name} already uses {type_name}")
+                    continue
+
+                values_sql = ", ".join(f"'{value}'" for value in values)
+
+                print(f"➕ Creating enum type {type_name}...")
+                result = await session.execute(text("SELECT 1 FROM pg_type WHERE typname = :type_name"), {"type_name": type_name})
+                if not result.fetchone():
+                    await session.execute(text(f"CREATE TYPE {type_name} AS ENUM ({values_sql})"))
+
+                for legacy_value, enum_value in legacy_values.get(table_name, {}).items():
+                    await session.execute(text(f"""
+                        UPDATE {table_name}
+                        SET {column_name} = :enum_value
+                        WHERE {column_name} = :legacy_value
+                    """), {"enum_value": enum_value, "legacy_value": legacy_value})
+
+                # Any other value has no known meaning; stop rather than overwrite it
+                result = await session.execute(text(f"""
+                    SELECT {column_name}, count(*)
+                    FROM {table_name}
+                    WHERE {column_name} NOT IN ({values_sql})
+                    GROUP BY {column_name}
+                """))
+                unknown = result.all()
+                if unknown:
+                    found = ", ".join(f"{value!r} ({count} rows)" for value, count in unknown)
+                    raise Exception(f"{table_name}.{column_name} has values outside {type_name}: {found}")
+
+                print(f"🔧 Converting {table_name}.{column_name} to {type_name}...")
+                await session.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} DROP DEFAULT"))
+                await session.execute(text(f"""
+                    ALTER TABLE {table_name}
+                    ALTER COLUMN {column_name} TYPE {type_name}
+                    USING {column_name}::{type_name}
+                """))
+                await session.execute(text(f"""
+                    ALTER TABLE {table_name}
+                    ALTER COLUMN {column_name} SET DEFAULT '{default}'
+                """))
+
+            for constraint_name, (table_name, condition) in check_constraints.items():
+                result = await session.execute(text("""
+                    SELECT 1 FROM pg_constraint WHERE conname = :constraint_name
+                """), {"constraint_name": constraint_name})
+
+                if result.fetchone():
+                    print(f"✅ Constraint {constraint_name} already exists")
+                    continue
+
+                print(f"➕ Adding constraint {constraint_name}...")
+                await session.execute(text(f"""
+                    ALTER TABLE {table_name}
+                    ADD CONSTRAINT {constraint_name} CHECK ({condition})
+                """))
+
+            print("✅ Successfully converted step status columns")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
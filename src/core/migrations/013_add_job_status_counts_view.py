@@ -0,0 +1,74 @@
+"""
+Migration: Add job_status_counts materialized view for dashboard counts
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Create the job_status_counts materialized view and its unique index"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Adding job_status_counts materialized view...")
+
+            # Check if the view already exists
+            result = await session.execute(text("""
+                SELECT matviewname
+                FROM pg_matviews
+                WHERE matviewname = 'job_status_counts'
+            """))
+
+            if result.fetchone():
+                print("✅ job_status_counts view already exists")
+                return
+
+            await session.execute(text("""
+                CREATE MATERIALIZED VIEW job_status_counts AS
+                SELECT company_id, status, job_type, count(*) AS job_count
+                FROM jobs
+                GROUP BY company_id, status, job_type
+            """))
+
+            # REFRESH ... CONCURRENTLY requires a unique index on the view
+            print("➕ Creating ux_job_status_counts index...")
+            await session.execute(text("""
+                CREATE UNIQUE INDEX ux_job_status_counts
+                ON job_status_counts (company_id, status, job_type)
+            """))
+
+            print("✅ Successfully added job_status_counts view")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,97 @@
+"""
+Migration: Enforce one active candidate_workflow per (candidate, job)
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Add uniq_active_candidate_workflow and the completed_at check constraint"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Enforcing one active workflow per candidate and job...")
+
+            result = await session.execute(text("""
+                SELECT indexname
+                FROM pg_indexes
+                WHERE indexname = 'uniq_active_candidate_workflow'
+            """))
+
+            if result.fetchone():
+                print("✅ uniq_active_candidate_workflow already exists")
+            else:
+                # Keep the newest active workflow of any duplicates, soft delete the rest
+                print("🧹 Soft deleting duplicate active workflows...")
+                await session.execute(text("""
+                    UPDATE candidate_workflow cw
+                    SET is_deleted = true
+                    FROM (
+                        SELECT id,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY candidate_id, job_id
+                                   ORDER BY created_at DESC
+                               ) AS position
+                        FROM candidate_workflow
+                        WHERE completed_at IS NULL AND is_deleted = false
+                    ) ranked
+                    WHERE cw.id = ranked.id AND ranked.position > 1
+                """))
+
+                print("➕ Creating uniq_active_candidate_workflow index...")
+                await session.execute(text("""
+                    CREATE UNIQUE INDEX uniq_active_candidate_workflow
+                    ON candidate_workflow (candidate_id, job_id)
+                    WHERE completed_at IS NULL AND is_deleted = false
+                """))
+
+            result = await session.execute(text("""
+                SELECT 1 FROM pg_constraint WHERE conname = 'ck_candidate_workflow_completed_after_start'
+            """))
+
+            if result.fetchone():
+                print("✅ ck_candidate_workflow_completed_after_start already exists")
+            else:
+                # NOT VALID: enforce for new writes without failing on legacy rows
+                print("➕ Adding ck_candidate_workflow_completed_after_start constraint...")
+                await session.execute(text("""
+                    ALTER TABLE candidate_workflow
+                    ADD CONSTRAINT ck_candidate_workflow_completed_after_start
+                    CHECK (completed_at IS NULL OR completed_at >= started_at) NOT VALID
+                """))
+
+            print("✅ Successfully added active workflow constraints")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,90 @@
+"""
+Migration: Replace workflow_template.steps_execution_id with workflow_template_step
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Create workflow_template_step, backfill it from the array column and drop the column"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Adding workflow_template_step table...")
+
+            # Check if the array column is already gone
+            result = await session.execute(text("""
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_name = 'workflow_template' AND column_name = 'steps_execution_id'
+            """))
+
+            if not result.fetchone():
+                print("✅ workflow_template_step already replaces steps_execution_id")
+                return
+
+            await session.execute(text("""
+                CREATE TABLE IF NOT EXISTS workflow_template_step (
+                    template_id UUID NOT NULL REFERENCES workflow_template(id) ON DELETE CASCADE,
+                    step_detail_id UUID NOT NULL REFERENCES workflow_step_detail(id),
+                    order_number INTEGER NOT NULL,
+                    PRIMARY KEY (template_id, step_detail_id)
+                )
+            """))
+
+            print("➕ Creating ix_workflow_template_step_order index...")
+            await session.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_workflow_template_step_order
+                ON workflow_template_step (template_id, order_number)
+            """))
+
+            # Array position becomes order_number; ids without a step detail row are dropped
+            print("📝 Backfilling workflow_template_step from steps_execution_id...")
+            await session.execute(text("""
+                INSERT INTO workflow_template_step (template_id, step_detail_id, order_number)
+                SELECT wt.id, entry.step_detail_id, entry.position
+                FROM workflow_template wt
+                CROSS JOIN LATERAL unnest(wt.steps_execution_id) WITH ORDINALITY AS entry(step_detail_id, position)
+                JOIN workflow_step_detail wsd ON wsd.id = entry.step_detail_id
+                ON CONFLICT (template_id, step_detail_id) DO NOTHING
+            """))
+
+            print("🗑️ Dropping steps_execution_id column...")
+            await session.execute(text("DROP INDEX IF EXISTS ix_workflow_template_steps_gin"))
+            await session.execute(text("ALTER TABLE workflow_template DROP COLUMN steps_execution_id"))
+
+            print("✅ Successfully added workflow_template_step table")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
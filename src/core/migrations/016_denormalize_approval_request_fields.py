@@ -0,0 +1,113 @@
+"""
+Migration: Denormalize step, candidate and job fields onto workflow_approval_requests
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Add the snapshot columns to workflow_approval_requests and backfill them"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    new_columns = {
+        'company_id': 'UUID REFERENCES companies(id) ON DELETE CASCADE',
+        'step_name': 'TEXT',
+        'step_display_name': 'TEXT',
+        'step_description': 'TEXT',
+        'step_type': 'TEXT',
+        'candidate_name': 'TEXT',
+        'candidate_email': 'TEXT',
+        'job_title': 'TEXT',
+        'job_department': 'TEXT',
+    }
+
+    async with async_session() as session:
+        try:
+            print("🔄 Denormalizing approval request listing fields...")
+
+            for column_name, column_type in new_columns.items():
+                result = await session.execute(text("""
+                    SELECT column_name
+                    FROM information_schema.columns
+                    WHERE table_name = 'workflow_approval_requests' AND column_name = :column_name
+                """), {"column_name": column_name})
+
+                if result.fetchone():
+                    print(f"✅ Column {column_name} already exists")
+                    continue
+
+                print(f"➕ Adding column {column_name}...")
+                await session.execute(text(f"""
+                    ALTER TABLE workflow_approval_requests
+                    ADD COLUMN {column_name} {column_type}
+                """))
+
+            print("➕ Creating ix_war_company_requested index...")
+            await session.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_war_company_requested
+                ON workflow_approval_requests (company_id, requested_at)
+            """))
+
+            # Only rows that were never populated are touched, so reruns are cheap
+            print("📝 Backfilling snapshot columns from steps, candidates and jobs...")
+            await session.execute(text("""
+                UPDATE workflow_approval_requests war
+                SET company_id = j.company_id,
+                    step_name = ws.name,
+                    step_display_name = ws.display_name,
+                    step_description = ws.description,
+                    step_type = ws.step_type,
+                    candidate_name = trim(concat_ws(' ', c.first_name, c.last_name)),
+                    candidate_email = c.email,
+                    job_title = j.title,
+                    job_department = j.department
+                FROM workflow_step_detail wsd, workflow_step ws, candidate_workflow cw, jobs j, candidates c
+                WHERE wsd.id = war.workflow_step_detail_id
+                  AND ws.id = wsd.workflow_step_id
+                  AND cw.id = war.candidate_workflow_id
+                  AND j.id = cw.job_id
+                  AND c.id = cw.candidate_id
+                  AND war.company_id IS NULL
+            """))
+
+            print("✅ Successfully denormalized approval request fields")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+
+    # VACUUM can't run inside a transaction block
+    try:
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            print("🧹 Running VACUUM ANALYZE workflow_approval_requests...")
+            await connection.execute(text("VACUUM ANALYZE workflow_approval_requests"))
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,66 @@
+"""
+Migration: Add partial index for awaiting workflow step details
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Create idx_wsd_awaiting on workflow_step_detail"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Adding awaiting step detail index...")
+
+            result = await session.execute(text("""
+                SELECT indexname
+                FROM pg_indexes
+                WHERE indexname = 'idx_wsd_awaiting'
+            """))
+
+            if result.fetchone():
+                print("✅ idx_wsd_awaiting already exists")
+                return
+
+            print("➕ Creating idx_wsd_awaiting index...")
+            await session.execute(text("""
+                CREATE INDEX idx_wsd_awaiting
+                ON workflow_step_detail (workflow_step_id, order_number)
+                WHERE status = 'awaiting' AND is_deleted = false
+            """))
+
+            print("✅ Successfully added awaiting step detail index")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,88 @@
+"""
+Migration: Convert workflow_step.step_type to a Postgres ENUM type
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Create the workflow_step_type enum and convert workflow_step.step_type to it"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    values = ('automated', 'manual', 'approval')
+    values_sql = ", ".join(f"'{value}'" for value in values)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Converting workflow_step.step_type to an enum...")
+
+            # Skip the conversion if the column already uses the enum type
+            result = await session.execute(text("""
+                SELECT udt_name
+                FROM information_schema.columns
+                WHERE table_name = 'workflow_step' AND column_name = 'step_type'
+            """))
+
+            if result.scalar_one_or_none() == 'workflow_step_type':
+                print("✅ workflow_step.step_type already uses workflow_step_type")
+                return
+
+            # Other step types have no enum equivalent; report them instead of overwriting
+            result = await session.execute(text(f"""
+                SELECT step_type, count(*)
+                FROM workflow_step
+                WHERE step_type NOT IN ({values_sql})
+                GROUP BY step_type
+            """))
+            unknown = result.all()
+            if unknown:
+                found = ", ".join(f"{value!r} ({count} rows)" for value, count in unknown)
+                raise Exception(f"workflow_step.step_type has values outside workflow_step_type: {found}")
+
+            print("➕ Creating enum type workflow_step_type...")
+            result = await session.execute(text("SELECT 1 FROM pg_type WHERE typname = 'workflow_step_type'"))
+            if not result.fetchone():
+                await session.execute(text(f"CREATE TYPE workflow_step_type AS ENUM ({values_sql})"))
+
+            print("🔧 Converting workflow_step.step_type to workflow_step_type...")
+            await session.execute(text("ALTER TABLE workflow_step ALTER COLUMN step_type DROP DEFAULT"))
+            await session.execute(text("""
+                ALTER TABLE workflow_step
+                ALTER COLUMN step_type TYPE workflow_step_type
+                USING step_type::workflow_step_type
+            """))
+
+            print("✅ Successfully converted workflow_step.step_type")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
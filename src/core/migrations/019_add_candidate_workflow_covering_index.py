@@ -0,0 +1,71 @@
+"""
+Migration: Replace the candidate-only candidate_workflow index with a covering (candidate_id, job_id) index
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Create idx_cw_candidate_job and drop ix_candidate_workflow_candidate_active"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Adding covering candidate workflow index...")
+
+            result = await session.execute(text("""
+                SELECT indexname
+                FROM pg_indexes
+                WHERE indexname = 'idx_cw_candidate_job'
+            """))
+
+            if result.fetchone():
+                print("✅ idx_cw_candidate_job already exists")
+                return
+
+            print("➕ Creating idx_cw_candidate_job index...")
+            await session.execute(text("""
+                CREATE INDEX idx_cw_candidate_job
+                ON candidate_workflow (candidate_id, job_id)
+                INCLUDE (current_step_detail_id, workflow_template_id)
+                WHERE is_deleted = false
+            """))
+
+            # candidate_id is the leading column of the new index
+            print("🗑️ Dropping ix_candidate_workflow_candidate_active index...")
+            await session.execute(text("DROP INDEX IF EXISTS ix_candidate_workflow_candidate_active"))
+
+            print("✅ Successfully added covering candidate workflow index")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,106 @@
+"""
+Migration: Enforce unique registration emails/domains and one pending invitation per email
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+# (index name, table, column) for the single-column unique keys registration relies on
+UNIQUE_COLUMNS = [
+    ("uniq_users_email", "users", "email"),
+    ("uniq_profiles_email", "profiles", "email"),
+    ("uniq_companies_domain", "companies", "domain"),
+]
+
+async def run_migration():
+    """Add the unique indexes that replace SELECT-then-INSERT checks in auth"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Adding registration unique indexes...")
+
+            for index_name, table, column in UNIQUE_COLUMNS:
+                # Tables created from the models already carry a <table>_<column>_key constraint
+                result = await session.execute(text("""
+                    SELECT 1
+                    FROM pg_index i
+                    JOIN pg_class t ON t.oid = i.indrelid
+                    JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = i.indkey[0]
+                    WHERE t.relname = :table AND a.attname = :column
+                      AND i.indisunique AND i.indnatts = 1 AND i.indpred IS NULL
+                """), {"table": table, "column": column})
+
+                if result.fetchone():
+                    print(f"✅ {table}.{column} is already unique")
+                    continue
+
+                print(f"➕ Creating {index_name} index...")
+                await session.execute(text(f"CREATE UNIQUE INDEX {index_name} ON {table} ({column})"))
+
+            result = await session.execute(text("""
+                SELECT indexname
+                FROM pg_indexes
+                WHERE indexname = 'uniq_pending_user_invitation'
+            """))
+
+            if result.fetchone():
+                print("✅ uniq_pending_user_invitation already exists")
+            else:
+                # Keep the newest pending invitation of any duplicates
+                print("🧹 Removing superseded pending invitations...")
+                await session.execute(text("""
+                    DELETE FROM user_invitations ui
+                    USING (
+                        SELECT id,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY email, company_id
+                                   ORDER BY created_at DESC
+                               ) AS position
+                        FROM user_invitations
+                        WHERE is_accepted = false
+                    ) ranked
+                    WHERE ui.id = ranked.id AND ranked.position > 1
+                """))
+
+                print("➕ Creating uniq_pending_user_invitation index...")
+                await session.execute(text("""
+                    CREATE UNIQUE INDEX uniq_pending_user_invitation
+                    ON user_invitations (email, company_id)
+                    WHERE is_accepted = false
+                """))
+
+            print("✅ Successfully added registration unique indexes")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
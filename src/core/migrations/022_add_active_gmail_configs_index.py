@@ -0,0 +1,68 @@
+"""
+Migration: Add partial index on active gmail_configs for the email poller
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Create idx_gmail_configs_active for the poller's keyset-paginated config query"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Adding active gmail_configs index...")
+
+            # Check if the index already exists
+            result = await session.execute(text("""
+                SELECT indexname
+                FROM pg_indexes
+                WHERE indexname = 'idx_gmail_configs_active'
+            """))
+
+            if result.fetchone():
+                print("✅ idx_gmail_configs_active already exists")
+                return
+
+            # Only active rows are indexed; the poller pages through them by id
+            print("➕ Creating idx_gmail_configs_active index...")
+            await session.execute(text("""
+                CREATE INDEX idx_gmail_configs_active
+                ON gmail_configs (id)
+                WHERE is_active = true
+            """))
+
+            print("✅ Successfully added active gmail_configs index")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
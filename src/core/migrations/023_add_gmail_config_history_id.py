@@ -0,0 +1,67 @@
+"""
+Migration: Add history_id to gmail_configs for the email poller
+Date: 2025-08-24
+"""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+async def run_migration():
+    """Add the Gmail history cursor column the poller resumes from"""
+
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise Exception("DATABASE_URL environment variable not set")
+
+    # Convert to async driver if needed
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    # Create async engine
+    engine = create_async_engine(database_url, echo=True)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as session:
+        try:
+            print("🔄 Adding history_id column to gmail_configs...")
+
+            # Check if the column already exists
+            result = await session.execute(text("""
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_name = 'gmail_configs' AND column_name = 'history_id'
+            """))
+
+            if result.fetchone():
+                print("✅ history_id column already exists in gmail_configs")
+                return
+
+            # Nullable: accounts without a cursor run the 24-hour query once and seed it
+            print("➕ Adding history_id column...")
+            await session.execute(text("""
+                ALTER TABLE gmail_configs
+                ADD COLUMN history_id VARCHAR(32)
+            """))
+
+            print("✅ Successfully added history_id column to gmail_configs")
+
+            # Commit the transaction
+            await session.commit()
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
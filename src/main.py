@@ -16,6 +16,14 @@ sys.path.append(os.path.dirname(__file__))
 from core.config import settings, validate_settings
 from core.database import check_database_connection, close_database
 from api import auth, users, gmail, workflows, emails, approvals, jobs, candidates
+from services.workflow_event_partitions import workflow_event_partitions
+from services.auth_service import auth_service
+from services.job_stats_service import job_stats_service
+from sqlalchemy.orm import configure_mappers
+from utils.json_response import ORJSONResponse
+
+# Resolve all model relationships once at import instead of on the first query
+configure_mappers()
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
@@ -41,6 +49,10 @@ async def lifespan(app: FastAPI):
         
         if db_success:
             print("✅ Database connection successful!")
+            # Monthly workflow_event partitions, created ahead of time
+            workflow_event_partitions.start()
+            # Periodic job_status_counts refresh behind the per-write one
+            job_stats_service.start()
         else:
             print("⚠️  Database connection failed, but continuing...")
         
@@ -54,6 +66,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("🛑 Shutting down HR Automation Backend...")
+    await workflow_event_partitions.stop()
+    await job_stats_service.stop()
+    # Queued last_login stamps go out before the engine is disposed
+    await auth_service.flush_login_stamps()
     await close_database()
     print("✅ Shutdown complete!")
 
@@ -65,7 +81,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
-    redirect_slashes=False
+    redirect_slashes=False,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -3,7 +3,7 @@ from .base import BaseModel
 from .user import Profile, UserRole, Company
 from .gmail_webhook import GmailWatch, EmailProcessingLog
 from .job import Job
-from .workflow import WorkflowTemplate, WorkflowStep, WorkflowStepDetail, CandidateWorkflow
+from .workflow import WorkflowTemplate, WorkflowTemplateStep, WorkflowStep, WorkflowStepDetail, CandidateWorkflow, WorkflowEvent
 from .approval import WorkflowApprovalRequest
 from .candidate_workflow_execution import CandidateWorkflowExecution
 
@@ -16,9 +16,11 @@ __all__ = [
     "EmailProcessingLog",
     "Job",
     "WorkflowTemplate",
+    "WorkflowTemplateStep",
     "WorkflowStep", 
     "WorkflowStepDetail", 
     "CandidateWorkflow",
+    "WorkflowEvent",
     "WorkflowApprovalRequest",
     "CandidateWorkflowExecution"
 ]
@@ -1,8 +1,8 @@
 """
 Workflow Approval System Models
 """
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID, ENUM, JSONB
+from sqlalchemy import Column, Text, Integer, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import BaseModel, UUIDMixin, Base
@@ -49,7 +49,19 @@ class WorkflowApprovalRequest(BaseModel):
     
     # Approval Details
     required_approvals = Column(Integer, nullable=False)
-    
+
+    # Snapshot of the step, candidate and job shown in approval listings,
+    # copied on insert so the listings don't join four parent tables
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=True)
+    step_name = Column(Text, nullable=True)
+    step_display_name = Column(Text, nullable=True)
+    step_description = Column(Text, nullable=True)
+    step_type = Column(Text, nullable=True)
+    candidate_name = Column(Text, nullable=True)
+    candidate_email = Column(Text, nullable=True)
+    job_title = Column(Text, nullable=True)
+    job_department = Column(Text, nullable=True)
+
     # Status Tracking
     status = Column(approval_status_enum, default='pending')
     requested_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -73,6 +85,15 @@ class WorkflowApprovalRequest(BaseModel):
             'approver_user_id',
             name='unique_approval_request_per_approver'
         ),
+        # Covers the pending/history listings (approver + status, newest first)
+        # so the join keys come straight from the index
+        Index(
+            'ix_war_approver_status_requested',
+            'approver_user_id', 'status', 'requested_at',
+            postgresql_include=['candidate_workflow_id', 'workflow_step_detail_id']
+        ),
+        # Admin listings scope by company instead of joining through jobs
+        Index('ix_war_company_requested', 'company_id', 'requested_at'),
     )
 
     def __repr__(self):
@@ -84,6 +105,9 @@ class WorkflowApproval(Base, UUIDMixin):
     Represents an individual approver's decision/response to an approval request.
     """
     __tablename__ = "workflow_approvals"
+    __table_args__ = (
+        Index('ix_workflow_approvals_request', 'approval_request_id', postgresql_include=['decision']),
+    )
 
     # Foreign Keys
     approval_request_id = Column(
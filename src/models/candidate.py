@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DateTime, Integer, Numeric, UniqueConstraint
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer, Numeric, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import BaseModel, BaseModelWithSoftDelete
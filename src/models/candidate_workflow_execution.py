@@ -1,19 +1,31 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DateTime, Integer, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Boolean, Text, ForeignKey, DateTime, Integer, JSON, CheckConstraint, Index, text
+from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import relationship
 from .base import BaseModelWithSoftDelete
 from datetime import datetime
-from typing import Optional
+
+execution_status_enum = ENUM(
+    'pending', 'running', 'finished', 'failed', 'rejected',
+    name='execution_status'
+)
 
 class CandidateWorkflowExecution(BaseModelWithSoftDelete):
     __tablename__ = "candidate_workflow_executions"
+    __table_args__ = (
+        Index(
+            'ix_cwe_candidate_job_step_active',
+            'candidate_id', 'job_id', 'workflow_step_detail_id',
+            postgresql_where=text("is_deleted = false")
+        ),
+        CheckConstraint('order_number > 0', name='ck_cwe_order_number_positive'),
+    )
     
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False, index=True)
     job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False, index=True)
     workflow_step_detail_id = Column(UUID(as_uuid=True), ForeignKey("workflow_step_detail.id"), nullable=False, index=True)
     
     # Execution tracking
-    execution_status = Column(String(50), nullable=False, default="pending", index=True)
+    execution_status = Column(execution_status_enum, nullable=False, default="pending", server_default="pending", index=True)
     started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
     current_step = Column(Boolean, default=False, nullable=False, index=True)
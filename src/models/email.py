@@ -1,7 +1,7 @@
 from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DateTime, Integer
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from .base import BaseModel, BaseModelWithSoftDelete
+from .base import BaseModel
 
 class EmailAccount(BaseModel):
     """Email account configuration"""
@@ -1,12 +1,17 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DateTime, Integer, Numeric
+from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DateTime, Integer, Numeric, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from .base import BaseModel, BaseModelWithSoftDelete
+from .base import BaseModel
 from .interview import Interview
 
 class Job(BaseModel):
     """Job posting model"""
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index('ix_jobs_company_status', 'company_id', 'status'),
+        Index('ix_jobs_status_posted', 'status', 'posted_at'),
+        Index('ix_jobs_active_company', 'company_id', postgresql_where=text("status = 'active'")),
+    )
     
     title = Column(String(255), nullable=False)
     short_id = Column(String(8), unique=True, nullable=False)  # Short unique identifier for emails
@@ -17,9 +22,9 @@ class Job(BaseModel):
     # Job details
     department = Column(String(100), nullable=True)
     location = Column(String(255), nullable=True)
-    job_type = Column(String(50), nullable=False)  # full-time, part-time, contract, internship
-    experience_level = Column(String(50), nullable=True)  # entry, mid, senior, executive
-    remote_policy = Column(String(50), nullable=True)  # remote, hybrid, onsite
+    job_type = Column(String(50), nullable=False, index=True)  # full-time, part-time, contract, internship
+    experience_level = Column(String(50), nullable=True, index=True)  # entry, mid, senior, executive
+    remote_policy = Column(String(50), nullable=True, index=True)  # remote, hybrid, onsite
     
     # Compensation
     salary_min = Column(Numeric(12, 2), nullable=True)
@@ -27,7 +32,7 @@ class Job(BaseModel):
     salary_currency = Column(String(3), default="USD", nullable=False)
     
     # Status and workflow
-    status = Column(String(50), default="draft", nullable=False)  # draft, active, paused, closed
+    status = Column(String(50), default="draft", nullable=False, index=True)  # draft, active, paused, closed
     workflow_template_id = Column(UUID(as_uuid=True), ForeignKey("workflow_template.id"), nullable=True)
     
     # Company and ownership
@@ -54,6 +59,26 @@ class Job(BaseModel):
     candidate_workflows = relationship("CandidateWorkflow", back_populates="job", cascade="all, delete-orphan")
     workflow_executions = relationship("CandidateWorkflowExecution", back_populates="job", cascade="all, delete-orphan")
 
+
+# Dashboard counts read by services.job_stats_service; also created by migration 013
+event.listen(
+    Job.__table__,
+    "after_create",
+    DDL("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS job_status_counts AS
+        SELECT company_id, status, job_type, count(*) AS job_count
+        FROM jobs
+        GROUP BY company_id, status, job_type
+    """)
+)
+# REFRESH ... CONCURRENTLY requires a unique index on the view
+event.listen(
+    Job.__table__,
+    "after_create",
+    DDL("CREATE UNIQUE INDEX IF NOT EXISTS ux_job_status_counts ON job_status_counts (company_id, status, job_type)")
+)
+event.listen(Job.__table__, "before_drop", DDL("DROP MATERIALIZED VIEW IF EXISTS job_status_counts"))
+
 class JobRequirement(BaseModel):
     """Job requirements model"""
     __tablename__ = "job_requirements"
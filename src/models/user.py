@@ -1,8 +1,7 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DateTime, Integer
+from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from .base import BaseModel, BaseModelWithSoftDelete
-from datetime import datetime
+from .base import BaseModel
 
 # Import for relationship references
 from .approval import WorkflowApprovalRequest
@@ -103,6 +102,13 @@ class User(BaseModel):
 class UserInvitation(BaseModel):
     """User invitation model"""
     __tablename__ = "user_invitations"
+    __table_args__ = (
+        # One open invitation per email and company; inserts rely on it instead of a pre-check
+        Index(
+            'uniq_pending_user_invitation', 'email', 'company_id',
+            unique=True, postgresql_where=text("is_accepted = false")
+        ),
+    )
     
     email = Column(String(255), nullable=False)
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
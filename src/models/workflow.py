@@ -1,81 +1,187 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Integer, ARRAY, DateTime
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+import uuid
+from typing import TYPE_CHECKING, Any, List, Optional
+from sqlalchemy import Boolean, Text, ForeignKey, Integer, BigInteger, CheckConstraint, DateTime, DDL, Index, PrimaryKeyConstraint, Sequence, and_, text, event, select, update
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
-from .base import BaseModel, BaseModelWithSoftDelete
+from .base import Base, BaseModel
+
+if TYPE_CHECKING:
+    # Annotation-only: these modules import this one, and the mapper resolves
+    # the relationship targets by name from the registry
+    from .approval import WorkflowApprovalRequest
+    from .candidate import Candidate
+    from .candidate_workflow_execution import CandidateWorkflowExecution
+    from .job import Job
+
+step_detail_status_enum = ENUM(
+    'awaiting', 'finished', 'rejected',
+    name='step_detail_status'
+)
+
+workflow_step_type_enum = ENUM(
+    'automated', 'manual', 'approval',
+    name='workflow_step_type'
+)
 
 class WorkflowTemplate(BaseModel):
     """Workflow template model - defines reusable workflow processes"""
     __tablename__ = "workflow_template"
+    __table_args__ = (
+        Index('ix_workflow_template_company_name_active', 'company_id', 'name', postgresql_where=text("is_deleted = false")),
+    )
     
-    name = Column(Text, nullable=False)
-    description = Column(Text, nullable=True)
-    category = Column(Text, nullable=False)
-    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
-    steps_execution_id = Column(ARRAY(UUID(as_uuid=True)), nullable=False, default=list)
-    is_deleted = Column(Boolean, default=False, nullable=False)
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    category: Mapped[str] = mapped_column(Text, nullable=False)
+    company_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Relationships
-    candidate_workflows = relationship("CandidateWorkflow", back_populates="workflow_template")
+    candidate_workflows: Mapped[List["CandidateWorkflow"]] = relationship(back_populates="workflow_template", lazy="raise_on_sql")
+    step_links: Mapped[List["WorkflowTemplateStep"]] = relationship(
+        cascade="all, delete-orphan", order_by="WorkflowTemplateStep.order_number", lazy="selectin"
+    )
+    steps: Mapped[List["WorkflowStepDetail"]] = relationship(
+        secondary="workflow_template_step", order_by="WorkflowTemplateStep.order_number", viewonly=True, lazy="raise_on_sql"
+    )
+    
+    @property
+    def steps_execution_id(self) -> List[uuid.UUID]:
+        """Ordered step detail IDs (the API's steps_execution_id field)"""
+        return [link.step_detail_id for link in self.step_links]
+    
+    @steps_execution_id.setter
+    def steps_execution_id(self, step_detail_ids: List[uuid.UUID]) -> None:
+        self.step_links = [
+            WorkflowTemplateStep(step_detail_id=step_detail_id, order_number=position)
+            for position, step_detail_id in enumerate(dict.fromkeys(step_detail_ids), start=1)
+        ]
+
+class WorkflowTemplateStep(Base):
+    """Ordered membership of step details in a workflow template"""
+    __tablename__ = "workflow_template_step"
+    __table_args__ = (
+        Index('ix_workflow_template_step_order', 'template_id', 'order_number'),
+    )
+    
+    template_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workflow_template.id", ondelete="CASCADE"), primary_key=True)
+    step_detail_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workflow_step_detail.id"), primary_key=True)
+    order_number: Mapped[int] = mapped_column(Integer, nullable=False)
 
 class WorkflowStep(BaseModel):
     """Workflow step model - defines individual reusable steps"""
     __tablename__ = "workflow_step"
+    __table_args__ = (
+        Index('ix_workflow_step_actions_gin', 'actions', postgresql_using='gin', postgresql_ops={'actions': 'jsonb_path_ops'}),
+    )
     
-    name = Column(Text, nullable=False)
-    display_name = Column(Text, nullable=True)  # Human-readable description for UI
-    description = Column(Text, nullable=True)   # Full AI prompt for execution
-    step_type = Column(Text, nullable=False)
-    actions = Column(JSONB, nullable=False, default=list)
-    is_deleted = Column(Boolean, default=False, nullable=False)
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    display_name: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Human-readable description for UI
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)   # Full AI prompt for execution
+    step_type: Mapped[str] = mapped_column(workflow_step_type_enum, nullable=False)
+    actions: Mapped[List[Any]] = mapped_column(JSONB, nullable=False, default=list)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Relationships
-    step_details = relationship("WorkflowStepDetail", back_populates="workflow_step")
+    step_details: Mapped[List["WorkflowStepDetail"]] = relationship(back_populates="workflow_step", lazy="raise_on_sql")
 
 class WorkflowStepDetail(BaseModel):
     """Workflow step detail model - configuration for steps in specific workflows"""
     __tablename__ = "workflow_step_detail"
+    __table_args__ = (
+        Index('ix_workflow_step_detail_approvers_gin', 'approvers', postgresql_using='gin', postgresql_ops={'approvers': 'jsonb_path_ops'}),
+        Index('ix_workflow_step_detail_step_active', 'workflow_step_id', postgresql_where=text("is_deleted = false")),
+        # Only awaiting rows are indexed, so it stays small as steps finish
+        Index(
+            'idx_wsd_awaiting', 'workflow_step_id', 'order_number',
+            postgresql_where=text("status = 'awaiting' AND is_deleted = false")
+        ),
+        CheckConstraint('order_number > 0', name='ck_workflow_step_detail_order_number_positive'),
+    )
     
-    workflow_step_id = Column(UUID(as_uuid=True), ForeignKey("workflow_step.id"), nullable=False)
-    delay_in_seconds = Column(Integer, nullable=True)
-    auto_start = Column(Boolean, nullable=False, default=False)
-    required_human_approval = Column(Boolean, nullable=False, default=False)
-    number_of_approvals_needed = Column(Integer, nullable=True)
-    approvers = Column(JSONB, default=list, nullable=False)  # Array of user IDs who can approve this step
-    status = Column(Text, nullable=False, default="awaiting")  # awaiting, finished, rejected
-    order_number = Column(Integer, nullable=False)
-    is_deleted = Column(Boolean, default=False, nullable=False)
+    workflow_step_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workflow_step.id"), nullable=False)
+    delay_in_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    auto_start: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    required_human_approval: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    number_of_approvals_needed: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    approvers: Mapped[List[Any]] = mapped_column(JSONB, default=list, nullable=False)  # Array of user IDs who can approve this step
+    status: Mapped[str] = mapped_column(step_detail_status_enum, nullable=False, default="awaiting", server_default="awaiting")
+    order_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Relationships
-    workflow_step = relationship("WorkflowStep", back_populates="step_details")
-    approval_requests = relationship("WorkflowApprovalRequest", back_populates="workflow_step_detail", cascade="all, delete-orphan")
-    executions = relationship("CandidateWorkflowExecution", back_populates="workflow_step_detail", cascade="all, delete-orphan")
+    workflow_step: Mapped["WorkflowStep"] = relationship(back_populates="step_details", lazy="raise_on_sql")
+    approval_requests: Mapped[List["WorkflowApprovalRequest"]] = relationship(back_populates="workflow_step_detail", cascade="all, delete-orphan", lazy="raise_on_sql")
+    executions: Mapped[List["CandidateWorkflowExecution"]] = relationship(back_populates="workflow_step_detail", cascade="all, delete-orphan", lazy="raise_on_sql")
 
 class CandidateWorkflow(BaseModel):
     """Candidate workflow model - tracks workflow instances for specific candidates"""
     __tablename__ = "candidate_workflow"
+    __table_args__ = (
+        # Covers "workflows for candidate X on job Y" as an index-only scan;
+        # also serves candidate-only lookups through its leading column
+        Index(
+            'idx_cw_candidate_job', 'candidate_id', 'job_id',
+            postgresql_include=['current_step_detail_id', 'workflow_template_id'],
+            postgresql_where=text("is_deleted = false")
+        ),
+        Index('ix_candidate_workflow_job_active', 'job_id', postgresql_where=text("is_deleted = false")),
+        Index('ix_candidate_workflow_template_active', 'workflow_template_id', postgresql_where=text("is_deleted = false")),
+        # At most one in-progress workflow per candidate and job
+        Index(
+            'uniq_active_candidate_workflow', 'candidate_id', 'job_id',
+            unique=True,
+            postgresql_where=text("completed_at IS NULL AND is_deleted = false")
+        ),
+        # In-flight workflows, newest first (a backward scan serves DESC)
+        Index(
+            'idx_cw_in_flight', 'started_at',
+            postgresql_where=text("completed_at IS NULL AND is_deleted = false")
+        ),
+        CheckConstraint('completed_at IS NULL OR completed_at >= started_at', name='ck_candidate_workflow_completed_after_start'),
+    )
     
-    name = Column(Text, nullable=False)
-    description = Column(Text, nullable=True)
-    category = Column(Text, nullable=False)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)
-    workflow_template_id = Column(UUID(as_uuid=True), ForeignKey("workflow_template.id"), nullable=False)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
-    current_step_detail_id = Column(UUID(as_uuid=True), ForeignKey("workflow_step_detail.id"), nullable=True)
-    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    completed_at = Column(DateTime, nullable=True)
-    execution_log = Column(JSONB, default=list, nullable=False)
-    steps_executed = Column(Integer, default=0, nullable=False)  # Track number of steps executed
-    workflow_completed = Column(Boolean, default=False, nullable=False)  # Track if workflow is completed
-    is_deleted = Column(Boolean, default=False, nullable=False)
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    category: Mapped[str] = mapped_column(Text, nullable=False)
+    job_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)
+    workflow_template_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workflow_template.id"), nullable=False)
+    candidate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
+    current_step_detail_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("workflow_step_detail.id"), nullable=True)
+    # Copied from the current step detail / step so advancing does not need to join them
+    current_order_number: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    current_step_type: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    current_required_human_approval: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    current_approvers: Mapped[Optional[List[Any]]] = mapped_column(JSONB, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Legacy log; new entries go to workflow_event. Deferred because it can be
+    # large and nothing lists it; use undefer() where it is really needed
+    execution_log: Mapped[List[Any]] = mapped_column(JSONB, default=list, nullable=False, deferred=True, deferred_raiseload=True)
+    last_event_summary: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)  # Copy of the latest WorkflowEvent payload
+    steps_executed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Track number of steps executed
+    workflow_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)  # Track if workflow is completed
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Relationships
-    job = relationship("Job", back_populates="candidate_workflows")
-    workflow_template = relationship("WorkflowTemplate", back_populates="candidate_workflows")
-    candidate = relationship("Candidate", back_populates="candidate_workflows")
-    current_step_detail = relationship("WorkflowStepDetail", foreign_keys=[current_step_detail_id])
-    approval_requests = relationship("WorkflowApprovalRequest", back_populates="candidate_workflow", cascade="all, delete-orphan")
+    job: Mapped["Job"] = relationship(back_populates="candidate_workflows", lazy="raise_on_sql")
+    workflow_template: Mapped["WorkflowTemplate"] = relationship(back_populates="candidate_workflows", lazy="raise_on_sql")
+    candidate: Mapped["Candidate"] = relationship(back_populates="candidate_workflows", lazy="raise_on_sql")
+    current_step_detail: Mapped[Optional["WorkflowStepDetail"]] = relationship(foreign_keys=[current_step_detail_id], lazy="raise_on_sql")
+    approval_requests: Mapped[List["WorkflowApprovalRequest"]] = relationship(back_populates="candidate_workflow", cascade="all, delete-orphan", lazy="raise_on_sql")
+    events: Mapped[List["WorkflowEvent"]] = relationship(back_populates="candidate_workflow", cascade="all, delete-orphan", order_by="WorkflowEvent.seq", lazy="raise_on_sql")
     
+    @hybrid_property
+    def is_active(self) -> bool:
+        """Still in flight: not completed and not deleted"""
+        return self.completed_at is None and not self.is_deleted
+
+    @is_active.expression
+    def is_active(cls):
+        return and_(cls.completed_at.is_(None), cls.is_deleted == False)
+
     # Add relationship to get workflow step details through the template
     @property
     def workflow_step_details(self):
@@ -84,4 +190,145 @@ class CandidateWorkflow(BaseModel):
             # This would need to be implemented with proper querying
             # For now, return empty list to avoid errors
             return []
-        return []
\ No newline at end of file
+        return []
+
+class WorkflowEvent(BaseModel):
+    """Workflow event model - append-only execution log entry for a candidate workflow"""
+    __tablename__ = "workflow_event"
+    __table_args__ = (
+        PrimaryKeyConstraint('id', 'created_at'),
+        Index('ix_workflow_event_workflow_seq', 'candidate_workflow_id', 'seq'),
+        Index('ix_workflow_event_created_brin', 'created_at', postgresql_using='brin'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},  # Monthly partitions, see migration 011
+    )
+    
+    # Partition key must be part of the primary key, after id
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, primary_key=True, nullable=False)
+    candidate_workflow_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("candidate_workflow.id"), nullable=False)
+    seq: Mapped[int] = mapped_column(BigInteger, Sequence('workflow_event_seq_seq'), nullable=False)  # Monotonic insertion order
+    event_type: Mapped[str] = mapped_column(Text, nullable=False)  # workflow_started, step_executed, workflow_rejected
+    payload: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
+    
+    # Relationships
+    candidate_workflow: Mapped["CandidateWorkflow"] = relationship(back_populates="events", lazy="raise_on_sql")
+
+# Adds the partition for one month. Only when the default partition already holds
+# rows for that month is it detached while they are moved across; otherwise this is
+# a plain CREATE ... PARTITION OF. Kept in sync with migration 011.
+WORKFLOW_EVENT_ADD_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION workflow_event_add_partition(month_start date) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    range_start date := CAST(date_trunc('month', month_start) AS date);
+    range_end date := CAST(date_trunc('month', month_start) + interval '1 month' AS date);
+    partition_name text := 'workflow_event_' || to_char(range_start, 'YYYY_MM');
+    has_rows boolean := false;
+BEGIN
+    -- Serializes concurrent callers (e.g. workers starting together) until commit
+    PERFORM pg_advisory_xact_lock(hashtext('workflow_event_add_partition'));
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    IF to_regclass('workflow_event_default') IS NOT NULL THEN
+        EXECUTE 'SELECT EXISTS (SELECT 1 FROM workflow_event_default'
+            || ' WHERE created_at >= ' || quote_literal(range_start)
+            || ' AND created_at < ' || quote_literal(range_end) || ')'
+            INTO has_rows;
+    END IF;
+    IF NOT has_rows THEN
+        EXECUTE 'CREATE TABLE ' || quote_ident(partition_name)
+            || ' PARTITION OF workflow_event FOR VALUES FROM ('
+            || quote_literal(range_start) || ') TO (' || quote_literal(range_end) || ')';
+        RETURN;
+    END IF;
+    -- The default partition already holds rows for this month, which would make
+    -- CREATE ... PARTITION OF fail: detach it while they are moved across
+    ALTER TABLE workflow_event DETACH PARTITION workflow_event_default;
+    EXECUTE 'CREATE TABLE ' || quote_ident(partition_name)
+        || ' PARTITION OF workflow_event FOR VALUES FROM ('
+        || quote_literal(range_start) || ') TO (' || quote_literal(range_end) || ')';
+    EXECUTE 'WITH moved AS (DELETE FROM workflow_event_default'
+        || ' WHERE created_at >= ' || quote_literal(range_start)
+        || ' AND created_at < ' || quote_literal(range_end)
+        || ' RETURNING *) INSERT INTO ' || quote_ident(partition_name) || ' SELECT * FROM moved';
+    ALTER TABLE workflow_event ATTACH PARTITION workflow_event_default DEFAULT;
+END;
+$$
+"""
+
+# A partitioned table rejects inserts until it has a partition; monthly ones are
+# added ahead of time by services.workflow_event_partitions
+event.listen(
+    WorkflowEvent.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS workflow_event_default PARTITION OF workflow_event DEFAULT")
+)
+event.listen(WorkflowEvent.__table__, "after_create", DDL(WORKFLOW_EVENT_ADD_PARTITION_FUNCTION))
+
+
+def _touch_templates(connection, template_ids) -> None:
+    """Bump updated_at on the given templates so every worker sees them as changed"""
+    connection.execute(
+        update(WorkflowTemplate.__table__)
+        .where(WorkflowTemplate.__table__.c.id.in_(template_ids))
+        .values(updated_at=datetime.utcnow())
+    )
+
+
+@event.listens_for(WorkflowTemplateStep, "after_insert")
+@event.listens_for(WorkflowTemplateStep, "after_update")
+@event.listens_for(WorkflowTemplateStep, "after_delete")
+def _touch_template_of_link(mapper, connection, target):
+    """A changed step list changes the template, even when its own row is not updated"""
+    _touch_templates(connection, [target.template_id])
+
+
+@event.listens_for(WorkflowStepDetail, "after_update")
+@event.listens_for(WorkflowStepDetail, "after_delete")
+def _touch_templates_of_step_detail(mapper, connection, target):
+    _touch_templates(
+        connection,
+        select(WorkflowTemplateStep.__table__.c.template_id).where(
+            WorkflowTemplateStep.__table__.c.step_detail_id == target.id
+        )
+    )
+
+
+@event.listens_for(WorkflowStep, "after_update")
+@event.listens_for(WorkflowStep, "after_delete")
+def _touch_templates_of_step(mapper, connection, target):
+    link = WorkflowTemplateStep.__table__
+    step_detail = WorkflowStepDetail.__table__
+    _touch_templates(
+        connection,
+        select(link.c.template_id)
+        .join(step_detail, link.c.step_detail_id == step_detail.c.id)
+        .where(step_detail.c.workflow_step_id == target.id)
+    )
+
+
+@event.listens_for(WorkflowStepDetail, "after_update")
+def _sync_current_step_detail(mapper, connection, target):
+    """Keep CandidateWorkflow's copy of the current step detail in sync"""
+    connection.execute(
+        update(CandidateWorkflow.__table__)
+        .where(CandidateWorkflow.__table__.c.current_step_detail_id == target.id)
+        .values(
+            current_order_number=target.order_number,
+            current_required_human_approval=target.required_human_approval,
+            current_approvers=target.approvers or [],
+        )
+    )
+
+
+@event.listens_for(WorkflowStep, "after_update")
+def _sync_current_step_type(mapper, connection, target):
+    """Keep CandidateWorkflow's copy of the current step type in sync"""
+    step_detail_ids = select(WorkflowStepDetail.__table__.c.id).where(
+        WorkflowStepDetail.__table__.c.workflow_step_id == target.id
+    )
+    connection.execute(
+        update(CandidateWorkflow.__table__)
+        .where(CandidateWorkflow.__table__.c.current_step_detail_id.in_(step_detail_ids))
+        .values(current_step_type=target.step_type)
+    )
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 from uuid import UUID
 
@@ -10,13 +10,13 @@ class CompanyCreate(BaseModel):
     description: Optional[str] = Field(None, description="Company description")
     website: Optional[str] = Field(None, max_length=500, description="Company website")
     industry: Optional[str] = Field(None, max_length=100, description="Industry")
-    size: Optional[str] = Field(None, description="Company size: startup, small, medium, large, enterprise")
+    size: Optional[Literal['startup', 'small', 'medium', 'large', 'enterprise']] = Field(None, description="Company size: startup, small, medium, large, enterprise")
     
-    @validator('size')
-    def validate_size(cls, v):
-        if v and v not in ['startup', 'small', 'medium', 'large', 'enterprise']:
-            raise ValueError('Size must be one of: startup, small, medium, large, enterprise')
-        return v
+    @field_validator('size', mode='before')
+    @classmethod
+    def empty_size_to_none(cls, v):
+        # An empty size has always meant "not provided"
+        return v or None
 
 class AdminUserCreate(BaseModel):
     """Schema for creating admin user"""
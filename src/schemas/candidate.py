@@ -10,7 +10,7 @@ class ResumeFileResponse(BaseModel):
     fileSize: int
     fileType: str
     downloadUrl: str
-    uploadedAt: str
+    uploadedAt: datetime
 
 # Communication schema
 class CommunicationResponse(BaseModel):
@@ -20,7 +20,7 @@ class CommunicationResponse(BaseModel):
     content: str
     sender: str
     recipient: str
-    timestamp: str
+    timestamp: datetime
     status: str  # 'sent', 'delivered', 'read', 'failed'
 
 # Workflow step schema
@@ -29,8 +29,8 @@ class WorkflowStepResponse(BaseModel):
     name: str
     type: str
     status: str  # 'pending', 'in_progress', 'completed', 'failed', 'waiting_approval'
-    startedAt: Optional[str] = None
-    completedAt: Optional[str] = None
+    startedAt: Optional[datetime] = None
+    completedAt: Optional[datetime] = None
     notes: Optional[str] = None
 
 # Main candidate response
@@ -42,7 +42,7 @@ class CandidateResponse(BaseModel):
     location: Optional[str] = None
     jobId: str
     jobTitle: str
-    applicationDate: str
+    applicationDate: datetime
     currentStep: str
     workflowProgress: List[WorkflowStepResponse]
     resume: ResumeFileResponse
@@ -50,8 +50,8 @@ class CandidateResponse(BaseModel):
     status: str  # 'active', 'pending', 'completed', 'rejected'
     notes: List[str]
     companyId: str
-    createdAt: str
-    updatedAt: str
+    createdAt: datetime
+    updatedAt: datetime
 
 # List response with pagination
 class CandidatesListResponse(BaseModel):
@@ -2,11 +2,16 @@
 Job-related Pydantic schemas
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
+JobType = Literal['full-time', 'part-time', 'contract', 'internship']
+ExperienceLevel = Literal['entry', 'mid', 'senior', 'executive']
+RemotePolicy = Literal['remote', 'hybrid', 'onsite']
+JobStatus = Literal['draft', 'active', 'paused', 'closed']
+
 class JobBase(BaseModel):
     """Base job schema with common fields"""
     title: str = Field(..., min_length=1, max_length=255)
@@ -14,9 +19,9 @@ class JobBase(BaseModel):
     requirements: Optional[str] = None
     department: Optional[str] = Field(None, max_length=100)
     location: Optional[str] = Field(None, max_length=255)
-    job_type: str = Field(..., pattern="^(full-time|part-time|contract|internship)$")
-    experience_level: Optional[str] = Field(None, pattern="^(entry|mid|senior|executive)$")
-    remote_policy: Optional[str] = Field(None, pattern="^(remote|hybrid|onsite)$")
+    job_type: JobType
+    experience_level: Optional[ExperienceLevel] = None
+    remote_policy: Optional[RemotePolicy] = None
     salary_min: Optional[Decimal] = Field(None, ge=0)
     salary_max: Optional[Decimal] = Field(None, ge=0)
     salary_currency: Optional[str] = Field("USD", max_length=3)
@@ -28,7 +33,7 @@ class JobBase(BaseModel):
 
 class JobCreate(JobBase):
     """Schema for creating a new job"""
-    status: Optional[str] = Field("draft", pattern="^(draft|active|paused|closed)$")
+    status: Optional[JobStatus] = "draft"
 
 class JobUpdate(BaseModel):
     """Schema for updating an existing job"""
@@ -37,13 +42,13 @@ class JobUpdate(BaseModel):
     requirements: Optional[str] = None
     department: Optional[str] = Field(None, max_length=100)
     location: Optional[str] = Field(None, max_length=255)
-    job_type: Optional[str] = Field(None, pattern="^(full-time|part-time|contract|internship)$")
-    experience_level: Optional[str] = Field(None, pattern="^(entry|mid|senior|executive)$")
-    remote_policy: Optional[str] = Field(None, pattern="^(remote|hybrid|onsite)$")
+    job_type: Optional[JobType] = None
+    experience_level: Optional[ExperienceLevel] = None
+    remote_policy: Optional[RemotePolicy] = None
     salary_min: Optional[Decimal] = Field(None, ge=0)
     salary_max: Optional[Decimal] = Field(None, ge=0)
     salary_currency: Optional[str] = Field(None, max_length=3)
-    status: Optional[str] = Field(None, pattern="^(draft|active|paused|closed)$")
+    status: Optional[JobStatus] = None
     workflow_template_id: Optional[UUID] = None
     assigned_to: Optional[UUID] = None
     posted_at: Optional[datetime] = None
@@ -67,3 +72,9 @@ class JobListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+
+class JobStatsResponse(BaseModel):
+    """Response schema for dashboard job counts"""
+    total: int
+    by_status: Dict[str, int]
+    by_type: Dict[str, int]
@@ -1,31 +1,44 @@
 """
 Workflow-related Pydantic schemas
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from enum import Enum
 from uuid import UUID
 
+class StepType(str, Enum):
+    automated = "automated"
+    manual = "manual"
+    approval = "approval"
+
+class StepDetailStatus(str, Enum):
+    awaiting = "awaiting"
+    finished = "finished"
+    rejected = "rejected"
+
 class WorkflowStepResponse(BaseModel):
     """Response schema for workflow steps"""
     id: UUID
     name: str
     display_name: Optional[str] = None  # Human-readable description for UI
     description: Optional[str] = None   # Full AI prompt for execution
-    step_type: str  # automated, manual, approval
+    step_type: StepType
     actions: List[Dict[str, Any]] = Field(default_factory=list)
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Validates a whole list of ORM rows in one call instead of one model per row
+WorkflowStepListAdapter = TypeAdapter(List[WorkflowStepResponse])
 
 class WorkflowStepCreate(BaseModel):
     """Schema for creating workflow steps"""
     name: str = Field(..., min_length=1, max_length=255)
     display_name: Optional[str] = Field(None, min_length=1, max_length=255)  # Human-readable description
     description: Optional[str] = None  # Full AI prompt
-    step_type: str = Field(..., pattern="^(automated|manual|approval)$")
+    step_type: StepType
     actions: List[Dict[str, Any]] = Field(default_factory=list)
 
 class WorkflowTemplateResponse(BaseModel):
@@ -38,8 +51,7 @@ class WorkflowTemplateResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class WorkflowStepDetailPopulated(BaseModel):
     """Populated workflow step detail with workflow step info"""
@@ -50,7 +62,7 @@ class WorkflowStepDetailPopulated(BaseModel):
     required_human_approval: bool = False
     number_of_approvals_needed: Optional[int] = None
     approvers: List[str] = Field(default_factory=list)  # List of approver user IDs (as strings)
-    status: str = "awaiting"
+    status: StepDetailStatus = StepDetailStatus.awaiting
     order_number: int
     created_at: datetime
     updated_at: datetime
@@ -58,8 +70,7 @@ class WorkflowStepDetailPopulated(BaseModel):
     # Populated workflow step info
     workflow_step: WorkflowStepResponse
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class WorkflowTemplatePopulated(BaseModel):
     """Populated workflow template with step details"""
@@ -74,8 +85,10 @@ class WorkflowTemplatePopulated(BaseModel):
     # Populated step details
     step_details: List[WorkflowStepDetailPopulated] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Serializes one populated template straight to JSON bytes
+WorkflowTemplatePopulatedAdapter = TypeAdapter(WorkflowTemplatePopulated)
 
 class WorkflowTemplateCreate(BaseModel):
     """Schema for creating workflow templates"""
@@ -109,13 +122,12 @@ class WorkflowStepDetailResponse(BaseModel):
     auto_start: bool = False
     required_human_approval: bool = False
     number_of_approvals_needed: Optional[int] = None
-    status: str = "awaiting"  # awaiting, finished, rejected
+    status: StepDetailStatus = StepDetailStatus.awaiting
     order_number: int
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class WorkflowStepDetailCreate(BaseModel):
     """Schema for creating workflow step details"""
@@ -139,11 +151,11 @@ class CandidateWorkflowResponse(BaseModel):
     started_at: datetime
     completed_at: Optional[datetime] = None
     execution_log: List[Dict[str, Any]] = Field(default_factory=list)
+    last_event_summary: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CandidateWorkflowCreate(BaseModel):
     """Schema for creating candidate workflows"""
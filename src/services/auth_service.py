@@ -1,57 +1,221 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from uuid import uuid4
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import os
 import secrets
+import time
 
+import orjson
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+import jwt
+from jwt import InvalidTokenError as JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, bindparam, func, lambda_stmt, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from core.config import settings
+from core.database import AsyncSessionLocal, constraint_name
+from utils.ttl_cache import TTLCache
 from models.user import User, Company, Profile, UserRole, UserInvitation
-from schemas.auth import CompanyRegistration, UserLogin, TokenData, AuthResponse, UserInviteCreate
+from schemas.auth import CompanyRegistration, UserLogin, TokenData, AuthResponse, UserResponse, CompanyResponse, UserInviteCreate
+
+logger = logging.getLogger(__name__)
+
+# Built once per process; every AuthService shares the loaded hash backends.
+# Hashes in any scheme other than the default are flagged for rehashing on login
+_PWD_CONTEXT = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    default=settings.PASSWORD_HASH_SCHEME,
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    deprecated="auto"
+)
+
+# Hashing is CPU-bound and releases the GIL, so run it off the event loop
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="password-hash")
+
+# Unique constraints registration relies on: the model's <table>_<column>_key,
+# or the index migration 021 adds to tables created before it
+_EMAIL_CONSTRAINTS = frozenset({
+    "users_email_key", "profiles_email_key", "uniq_users_email", "uniq_profiles_email"
+})
+_DOMAIN_CONSTRAINTS = frozenset({"companies_domain_key", "uniq_companies_domain"})
+
+# HMAC digests for the algorithms we sign without going through PyJWT
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+# Executed with one parameter set per queued login
+_LOGIN_STAMP_STMT = (
+    update(Profile.__table__)
+    .where(Profile.__table__.c.id == bindparam("profile_id"))
+    .values(
+        last_login=bindparam("login_at"),
+        first_login_at=func.coalesce(Profile.__table__.c.first_login_at, bindparam("login_at"))
+    )
+)
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+class _OrjsonJWT(jwt.PyJWT):
+    """PyJWT with orjson parsing the claims; signature and claim checks stay PyJWT's"""
+    
+    def _decode_payload(self, decoded: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+_JWT = _OrjsonJWT(options={"require": ["exp"]})
+
 
 class AuthService:
     """Authentication service"""
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = _PWD_CONTEXT
+        self._hash_pool = _HASH_POOL
+        # Decoded tokens, so repeat requests with the same token skip verification and JSON parsing
+        self._token_cache = TTLCache(maxsize=10000, ttl=5.0)
+        # Role rows (id, name, display_name) by name; roles are seeded and almost never change
+        self._role_cache = TTLCache(maxsize=64, ttl=300.0)
+        # Profile id -> latest login time, written in bulk off the login path
+        self._pending_logins: Dict[Any, datetime] = {}
+        self._login_flush_task: Optional[asyncio.Task] = None
+        self.login_flush_seconds = 2.0
+        # The JWT header and signing key never change, so encode them once
+        self._jwt_digest = _HMAC_DIGESTS.get(settings.ALGORITHM)
+        self._jwt_key = settings.SECRET_KEY.encode()
+        self._jwt_header_b64 = _b64url(orjson.dumps({"alg": settings.ALGORITHM, "typ": "JWT"}))
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
         return self.pwd_context.verify(plain_password, hashed_password)
     
+    def verify_and_update_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify password and return a replacement hash if the stored one is outdated"""
+        return self.pwd_context.verify_and_update(plain_password, hashed_password)
+    
     def get_password_hash(self, password: str) -> str:
         """Generate password hash"""
         return self.pwd_context.hash(password)
     
+    async def averify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password on the hashing thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._hash_pool, self.verify_password, plain_password, hashed_password)
+    
+    async def averify_and_update_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """verify_and_update_password on the hashing thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._hash_pool, self.verify_and_update_password, plain_password, hashed_password)
+    
+    async def aget_password_hash(self, password: str) -> str:
+        """get_password_hash on the hashing thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._hash_pool, self.get_password_hash, password)
+    
+    def schedule_login_stamp(self, profile_id, login_at: datetime) -> None:
+        """Queue a last_login update; queued stamps are written together shortly after"""
+        self._pending_logins[profile_id] = login_at
+        if self._login_flush_task and not self._login_flush_task.done():
+            return
+        self._login_flush_task = asyncio.create_task(self._flush_login_stamps_later())
+    
+    async def _flush_login_stamps_later(self) -> None:
+        # Loop so logins queued while a flush is running aren't left behind
+        while self._pending_logins:
+            await asyncio.sleep(self.login_flush_seconds)
+            await self._write_login_stamps()
+    
+    async def flush_login_stamps(self) -> None:
+        """Write queued login stamps now instead of after the delay; called at shutdown"""
+        task = self._login_flush_task
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._login_flush_task = None
+        await self._write_login_stamps()
+    
+    async def _write_login_stamps(self) -> None:
+        pending, self._pending_logins = self._pending_logins, {}
+        if not pending:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    _LOGIN_STAMP_STMT,
+                    [{"profile_id": profile_id, "login_at": login_at} for profile_id, login_at in pending.items()]
+                )
+                await session.commit()
+            logger.debug(f"🕒 Recorded {len(pending)} login(s)")
+        except asyncio.CancelledError:
+            # Cancelled by flush_login_stamps, which writes them again
+            for profile_id, login_at in pending.items():
+                self._pending_logins.setdefault(profile_id, login_at)
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to record {len(pending)} login(s): {e}")
+    
     def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         """Create access token"""
         to_encode = data.copy()
         
+        # exp as integer epoch seconds, which is what ends up in the token anyway
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = int(time.time() + expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+            expire = int(time.time()) + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         
         to_encode.update({"exp": expire, "type": "access"})
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-        return encoded_jwt
+        return self._encode_token(to_encode)
     
     def create_refresh_token(self, data: Dict[str, Any]) -> str:
         """Create refresh token"""
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expire = int(time.time()) + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
         to_encode.update({"exp": expire, "type": "refresh"})
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-        return encoded_jwt
+        return self._encode_token(to_encode)
+    
+    def _encode_token(self, claims: Dict[str, Any]) -> str:
+        """Sign claims as a JWT, using the precomputed header and key for HMAC algorithms"""
+        if self._jwt_digest is None:
+            return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        
+        signing_input = self._jwt_header_b64 + b"." + _b64url(orjson.dumps(claims))
+        signature = hmac.new(self._jwt_key, signing_input, self._jwt_digest).digest()
+        return (signing_input + b"." + _b64url(signature)).decode()
+    
+    def _decode_token(self, token: str) -> Dict[str, Any]:
+        """Verify and decode a JWT"""
+        return _JWT.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     
     def verify_token(self, token: str, token_type: str = "access") -> Optional[TokenData]:
         """Verify and decode token"""
+        cache_key = (hashlib.blake2b(token.encode(), digest_size=16).digest(), token_type)
+        token_data = self._token_cache.get(cache_key)
+        if token_data is not None:
+            return token_data
+        
         try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            payload = self._decode_token(token)
             
             # Check token type
             if payload.get("type") != token_type:
@@ -65,15 +229,35 @@ class AuthService:
             if user_id is None:
                 return None
             
-            return TokenData(
+            token_data = TokenData(
                 user_id=user_id,
                 email=email,
                 company_id=company_id,
                 role_id=role_id
             )
+            
+            # Never keep a token cached past its own expiry
+            ttl = self._token_cache.ttl
+            if payload.get("exp") is not None:
+                ttl = min(payload["exp"] - time.time(), ttl)
+            if ttl > 0:
+                self._token_cache.set(cache_key, token_data, ttl=ttl)
+            return token_data
         except JWTError:
             return None
     
+    async def get_role_by_name(self, db: AsyncSession, name: str):
+        """Return the (id, name, display_name) row of a role, or None"""
+        role = self._role_cache.get(name)
+        if role is None:
+            result = await db.execute(
+                select(UserRole.id, UserRole.name, UserRole.display_name).where(UserRole.name == name)
+            )
+            role = result.one_or_none()
+            if role is not None:
+                self._role_cache.set(name, role)
+        return role
+    
     async def register_company_and_admin(
         self, 
         db: AsyncSession, 
@@ -81,31 +265,17 @@ class AuthService:
     ) -> AuthResponse:
         """Register new company with admin user"""
         
-        # Check if email already exists
-        existing_user = await db.execute(
-            select(User).where(User.email == registration.admin_user.email)
-        )
-        if existing_user.scalar_one_or_none():
-            raise ValueError("Email already registered")
-        
-        # Check if company domain already exists
-        if registration.company.domain:
-            existing_company = await db.execute(
-                select(Company).where(Company.domain == registration.company.domain)
-            )
-            if existing_company.scalar_one_or_none():
-                raise ValueError("Company domain already registered")
-        
         # Get admin role
-        admin_role = await db.execute(
-            select(UserRole).where(UserRole.name == "admin")
-        )
-        admin_role = admin_role.scalar_one_or_none()
+        admin_role = await self.get_role_by_name(db, "admin")
         if not admin_role:
             raise ValueError("Admin role not found")
         
-        # Create company
+        password_hash = await self.aget_password_hash(registration.admin_user.password)
+        
+        # Ids are generated here so the three rows go out in one flush; the
+        # unit of work orders the INSERTs by their foreign keys
         company = Company(
+            id=uuid4(),
             name=registration.company.name,
             domain=registration.company.domain,
             description=registration.company.description,
@@ -114,127 +284,150 @@ class AuthService:
             size=registration.company.size,
             settings={}
         )
-        db.add(company)
-        await db.flush()  # Get company ID
         
-        # Create profile
         profile = Profile(
+            id=uuid4(),
             email=registration.admin_user.email,
+            password_hash=password_hash,
             first_name=registration.admin_user.first_name,
             last_name=registration.admin_user.last_name,
             phone=registration.admin_user.phone,
             company_id=company.id,
             role_id=admin_role.id,
-            preferences={}
+            preferences={},
+            last_login=datetime.utcnow()
         )
-        db.add(profile)
-        await db.flush()  # Get profile ID
         
-        # Create user
         user = User(
             email=registration.admin_user.email,
-            password_hash=self.get_password_hash(registration.admin_user.password),
+            password_hash=password_hash,
             is_verified=True,
             is_active=True,
             profile_id=profile.id
         )
-        db.add(user)
-        
-        await db.commit()
+        db.add_all([company, profile, user])
         
-        # Refresh objects to get relationships
-        await db.refresh(company)
-        await db.refresh(profile)
-        await db.refresh(user)
+        # Every column is filled client-side, and the session doesn't expire
+        # on commit, so the objects can be read back without a refresh.
+        # Duplicate emails and domains are caught by their unique indexes.
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            violated = constraint_name(e)
+            if violated in _DOMAIN_CONSTRAINTS:
+                raise ValueError("Company domain already registered")
+            if violated in _EMAIL_CONSTRAINTS:
+                raise ValueError("Email already registered")
+            raise
         
-        # Create tokens
+        return self._build_auth_response(user.id, profile, company, admin_role)
+    
+    def _build_auth_response(self, subject, profile: Profile, company: Company, role) -> AuthResponse:
+        """Issue an access/refresh token pair for `subject` and wrap it with the user and company"""
         token_data = {
-            "sub": str(user.id),
-            "email": user.email,
+            "sub": str(subject),
+            "email": profile.email,
             "company_id": str(company.id),
-            "role_id": str(admin_role.id)
+            "role_id": str(role.id)
         }
         
-        access_token = self.create_access_token(token_data)
-        refresh_token = self.create_refresh_token(token_data)
-        
-        # Update last login
-        profile.last_login = datetime.utcnow()
-        await db.commit()
-        
-        return AuthResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
+        # Every value comes from ORM rows we just loaded or wrote, so skip re-validation
+        return AuthResponse.model_construct(
+            access_token=self.create_access_token(token_data),
+            refresh_token=self.create_refresh_token(token_data),
             expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            user={
-                "id": profile.id,
-                "email": profile.email,
-                "first_name": profile.first_name,
-                "last_name": profile.last_name,
-                "avatar_url": profile.avatar_url,
-                "phone": profile.phone,
-                "is_active": profile.is_active,
-                "last_login": profile.last_login,
-                "preferences": profile.preferences,
-                "company_id": company.id,
-                "role_id": admin_role.id,
-                "role_name": admin_role.name,
-                "role_display_name": admin_role.display_name,
-                "created_at": profile.created_at,
-                "updated_at": profile.updated_at
-            },
-            company={
-                "id": company.id,
-                "name": company.name,
-                "domain": company.domain,
-                "description": company.description,
-                "website": company.website,
-                "industry": company.industry,
-                "size": company.size,
-                "logo_url": company.logo_url,
-                "is_active": company.is_active,
-                "settings": company.settings,
-                "created_at": company.created_at,
-                "updated_at": company.updated_at
-            }
+            user=self.build_user_response(profile, role),
+            company=self.build_company_response(company)
+        )
+    
+    @staticmethod
+    def build_user_response(profile: Profile, role=None) -> UserResponse:
+        """UserResponse for a loaded profile; `role` is any object with id, name and display_name"""
+        # Every value comes from ORM rows we just loaded or wrote, so skip re-validation
+        return UserResponse.model_construct(
+            id=profile.id,
+            email=profile.email,
+            first_name=profile.first_name,
+            last_name=profile.last_name,
+            avatar_url=profile.avatar_url,
+            phone=profile.phone,
+            is_active=profile.is_active,
+            last_login=profile.last_login,
+            preferences=profile.preferences,
+            company_id=profile.company_id,
+            role_id=role.id if role else profile.role_id,
+            role_name=role.name if role else None,
+            role_display_name=role.display_name if role else None,
+            created_at=profile.created_at,
+            updated_at=profile.updated_at
+        )
+    
+    @staticmethod
+    def build_company_response(company: Company) -> CompanyResponse:
+        """CompanyResponse for a loaded company row"""
+        return CompanyResponse.model_construct(
+            id=company.id,
+            name=company.name,
+            domain=company.domain,
+            description=company.description,
+            website=company.website,
+            industry=company.industry,
+            size=company.size,
+            logo_url=company.logo_url,
+            is_active=company.is_active,
+            settings=company.settings,
+            created_at=company.created_at,
+            updated_at=company.updated_at
         )
     
     async def authenticate_user(self, db: AsyncSession, email: str, password: str) -> Optional[Profile]:
         """Authenticate user with email and password"""
         try:
-            # First, get the profile
-            result = await db.execute(
-                select(Profile)
+            # Profile, its company and role, and the legacy users-table hash in one round trip.
+            # lambda_stmt builds the statement once; later calls only bind `email`
+            result = await db.execute(lambda_stmt(
+                lambda: select(Profile, User.id.label("legacy_user_id"), User.password_hash.label("legacy_hash"))
+                .outerjoin(User, and_(User.profile_id == Profile.id, User.is_active == True))
                 .options(
-                    selectinload(Profile.company),
-                    selectinload(Profile.role)
+                    joinedload(Profile.company),
+                    joinedload(Profile.role)
                 )
                 .where(Profile.email == email, Profile.is_active == True)
-            )
-            profile = result.scalar_one_or_none()
+            ))
+            row = result.first()
             
-            if not profile:
+            if not row:
                 return None
+            profile, legacy_user_id, legacy_hash = row
             
-            # Check if profile has password hash (new user system)
-            if profile.password_hash and self.verify_password(password, profile.password_hash):
-                return profile
+            # Check if profile has password hash (new user system).
+            # Outdated hashes are replaced here, once per user
+            if profile.password_hash:
+                verified, new_hash = await self.averify_and_update_password(password, profile.password_hash)
+                if verified:
+                    if new_hash:
+                        profile.password_hash = new_hash
+                        await db.commit()
+                    return profile
             
             # Fall back to old User table for existing users
-            user_result = await db.execute(
-                select(User)
-                .where(User.profile_id == profile.id, User.is_active == True)
-            )
-            user = user_result.scalar_one_or_none()
-            
-            if user and user.password_hash and self.verify_password(password, user.password_hash):
-                return profile
+            if legacy_hash:
+                verified, new_hash = await self.averify_and_update_password(password, legacy_hash)
+                if verified:
+                    if new_hash:
+                        await db.execute(
+                            update(User).where(User.id == legacy_user_id).values(password_hash=new_hash)
+                        )
+                        await db.commit()
+                    return profile
             
             return None
-        except Exception as e:
-            import sys
-            print(f"❌ Error in authenticate_user: {e}", file=sys.stderr)
+        except Exception:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("❌ Error in authenticate_user", exc_info=True)
             return None
+    
     async def login_user(self, db: AsyncSession, login_data: UserLogin) -> AuthResponse:
         """Login user and return tokens"""
         profile = await self.authenticate_user(db, login_data.email, login_data.password)
@@ -242,66 +435,39 @@ class AuthService:
         if not profile:
             raise ValueError("Invalid email or password")
         
-        # Create tokens
-        token_data = {
-            "sub": str(profile.id),
-            "email": profile.email,
-            "company_id": str(profile.company.id),
-            "role_id": str(profile.role.id)
-        }
-        
-        access_token = self.create_access_token(token_data)
-        refresh_token = self.create_refresh_token(token_data)
-        
-        # Update last login and first login tracking
-        profile.last_login = datetime.utcnow()
+        # Last/first login are written by a batched background UPDATE; the
+        # loaded profile gets the new values without being marked dirty
+        now = datetime.utcnow()
+        set_committed_value(profile, "last_login", now)
         if not profile.first_login_at:
-            profile.first_login_at = datetime.utcnow()
-        
-        await db.commit()
+            set_committed_value(profile, "first_login_at", now)
+        self.schedule_login_stamp(profile.id, now)
         
-        return AuthResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            user={
-                "id": profile.id,
-                "email": profile.email,
-                "first_name": profile.first_name,
-                "last_name": profile.last_name,
-                "avatar_url": profile.avatar_url,
-                "phone": profile.phone,
-                "is_active": profile.is_active,
-                "last_login": profile.last_login,
-                "preferences": profile.preferences,
-                "company_id": profile.company.id,
-                "role_id": profile.role.id,
-                "role_name": profile.role.name,
-                "role_display_name": profile.role.display_name,
-                "created_at": profile.created_at,
-                "updated_at": profile.updated_at
-            },
-            company={
-                "id": profile.company.id,
-                "name": profile.company.name,
-                "domain": profile.company.domain,
-                "description": profile.company.description,
-                "website": profile.company.website,
-                "industry": profile.company.industry,
-                "size": profile.company.size,
-                "logo_url": profile.company.logo_url,
-                "is_active": profile.company.is_active,
-                "settings": profile.company.settings,
-                "created_at": profile.company.created_at,
-                "updated_at": profile.company.updated_at
-            }
+        return self._build_auth_response(profile.id, profile, profile.company, profile.role)
+    
+    @staticmethod
+    def _select_profile_for_subject(uid):
+        """Active profile, with company and role joined in, for a token subject"""
+        # Tokens carry Profile.id (new system) or User.id (old system); both
+        # branches restrict profiles.id, so the lookup stays on its primary key.
+        # Built once as a lambda statement, with `uid` as its only parameter
+        return lambda_stmt(
+            lambda: select(Profile)
+            .options(
+                joinedload(Profile.company),
+                joinedload(Profile.role)
+            )
+            .where(or_(
+                and_(Profile.id == uid, Profile.is_active == True),
+                Profile.id == select(User.profile_id).where(
+                    User.id == uid, User.is_active == True
+                ).scalar_subquery()
+            ))
+            .limit(1)
         )
     
     async def get_current_user(self, db: AsyncSession, token: str) -> Optional[Profile]:
         """Get current user from token"""
-        import logging
-        logger = logging.getLogger(__name__)
-        
         token_data = self.verify_token(token)
         
         if not token_data or not token_data.user_id:
@@ -310,37 +476,11 @@ class AuthService:
         
         logger.info(f"🔍 [AUTH] Looking for user with ID: {token_data.user_id}")
         
-        # First try to find by Profile.id (new system)
-        result = await db.execute(
-            select(Profile)
-            .options(
-                selectinload(Profile.company),
-                selectinload(Profile.role)
-            )
-            .where(Profile.id == token_data.user_id, Profile.is_active == True)
-        )
-        profile = result.scalar_one_or_none()
+        result = await db.execute(self._select_profile_for_subject(token_data.user_id))
         
+        profile = result.scalars().first()
         if profile:
             logger.info(f"🔍 [AUTH] Found profile {profile.id} with role: {profile.role.name if profile.role else 'None'}")
-            return profile
-        
-        logger.info(f"🔍 [AUTH] Profile not found, trying User table")
-        
-        # Fall back to old system - find by User.id
-        result = await db.execute(
-            select(Profile)
-            .options(
-                selectinload(Profile.company),
-                selectinload(Profile.role)
-            )
-            .join(User, User.profile_id == Profile.id)
-            .where(User.id == token_data.user_id, User.is_active == True)
-        )
-        
-        profile = result.scalar_one_or_none()
-        if profile:
-            logger.info(f"🔍 [AUTH] Found profile via User table {profile.id} with role: {profile.role.name if profile.role else 'None'}")
         else:
             logger.warning(f"⚠️ [AUTH] No profile found for user_id {token_data.user_id}")
         
@@ -353,75 +493,14 @@ class AuthService:
         if not token_data or not token_data.user_id:
             raise ValueError("Invalid refresh token")
         
-        # Get user and profile
-        result = await db.execute(
-            select(User)
-            .options(selectinload(User.profile))
-            .where(User.id == token_data.user_id, User.is_active == True)
-        )
-        user = result.scalar_one_or_none()
+        result = await db.execute(self._select_profile_for_subject(token_data.user_id))
+        profile = result.scalars().first()
         
-        if not user or not user.profile:
+        if not profile:
             raise ValueError("User not found")
         
-        # Get full profile with relationships
-        result = await db.execute(
-            select(Profile)
-            .options(
-                selectinload(Profile.company),
-                selectinload(Profile.role)
-            )
-            .where(Profile.id == user.profile_id)
-        )
-        profile = result.scalar_one()
-        
-        # Create new tokens
-        new_token_data = {
-            "sub": str(user.id),
-            "email": user.email,
-            "company_id": str(profile.company.id),
-            "role_id": str(profile.role.id)
-        }
-        
-        access_token = self.create_access_token(new_token_data)
-        new_refresh_token = self.create_refresh_token(new_token_data)
-        
-        return AuthResponse(
-            access_token=access_token,
-            refresh_token=new_refresh_token,
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            user={
-                "id": profile.id,
-                "email": profile.email,
-                "first_name": profile.first_name,
-                "last_name": profile.last_name,
-                "avatar_url": profile.avatar_url,
-                "phone": profile.phone,
-                "is_active": profile.is_active,
-                "last_login": profile.last_login,
-                "preferences": profile.preferences,
-                "company_id": profile.company.id,
-                "role_id": profile.role.id,
-                "role_name": profile.role.name,
-                "role_display_name": profile.role.display_name,
-                "created_at": profile.created_at,
-                "updated_at": profile.updated_at
-            },
-            company={
-                "id": profile.company.id,
-                "name": profile.company.name,
-                "domain": profile.company.domain,
-                "description": profile.company.description,
-                "website": profile.company.website,
-                "industry": profile.company.industry,
-                "size": profile.company.size,
-                "logo_url": profile.company.logo_url,
-                "is_active": profile.company.is_active,
-                "settings": profile.company.settings,
-                "created_at": profile.company.created_at,
-                "updated_at": profile.company.updated_at
-            }
-        )
+        # New tokens keep the incoming subject
+        return self._build_auth_response(token_data.user_id, profile, profile.company, profile.role)
     
     async def create_user_invitation(
         self, 
@@ -434,22 +513,11 @@ class AuthService:
         
         # Check if email already exists
         existing_user = await db.execute(
-            select(User).where(User.email == invitation.email)
+            select(User.id).where(User.email == invitation.email)
         )
         if existing_user.scalar_one_or_none():
             raise ValueError("Email already registered")
         
-        # Check if invitation already exists
-        existing_invitation = await db.execute(
-            select(UserInvitation).where(
-                UserInvitation.email == invitation.email,
-                UserInvitation.company_id == company_id,
-                UserInvitation.is_accepted == False
-            )
-        )
-        if existing_invitation.scalar_one_or_none():
-            raise ValueError("Invitation already sent")
-        
         # Create invitation
         invitation_token = secrets.token_urlsafe(32)
         expires_at = datetime.utcnow() + timedelta(days=7)  # 7 days to accept
@@ -464,7 +532,17 @@ class AuthService:
         )
         
         db.add(user_invitation)
-        await db.commit()
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if constraint_name(e) == "uniq_pending_user_invitation":
+                raise ValueError("Invitation already sent")
+            raise
         await db.refresh(user_invitation)
         
         return user_invitation
+
+
+# Global instance
+auth_service = AuthService()
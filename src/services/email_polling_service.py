@@ -1,23 +1,139 @@
 import asyncio
+import json
 import logging
+import random
+import re
+from email import policy
+from email.parser import BytesParser
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 
-from core.database import get_db
+from core.database import AsyncSessionLocal, constraint_name
 from services.gmail_service import gmail_service
+from services.job_cache import job_cache
+from services.workflow_template_cache import workflow_template_cache
 
 logger = logging.getLogger(__name__)
 
+
+def _substring_pattern(words) -> re.Pattern:
+    """Case-insensitive pattern matching any of `words` anywhere in a string"""
+    return re.compile("|".join(re.escape(word) for word in words), re.IGNORECASE)
+
+
+# Job application classification, one regex scan per list instead of a loop of `in` checks
+_PROMOTIONAL_KEYWORD_RE = _substring_pattern([
+    'discount', 'sale', 'offer', 'deal', 'promo', 'coupon', 'save',
+    'limited time', 'free shipping', 'newsletter', 'unsubscribe',
+    'marketing', 'notification', 'alert', 'update', 'new feature',
+    'product', 'service', 'buy now', 'shop', 'store', 'purchase',
+    'trip', 'travel', 'hotel', 'vacation', 'booking', 'reservation',
+    'conference', 'event', 'webinar', 'seminar', 'workshop',
+    'startup', 'showcase', 'demo', 'launch', 'announcement'
+])
+
+_PROMOTIONAL_SENDER_RE = _substring_pattern([
+    'tripadvisor.com', 'gucci.com', 'lovable.dev', 'yourstory.com',
+    'mobbin.com', 'coursiv.co', 'vervecoffee.com', 'sanimabank.com',
+    'notifications', 'no-reply', 'noreply', 'marketing', 'promo'
+])
+
+# Job keywords are matched as whole subject words, so e.g. "role" no longer
+# matches "payroll"; common inflections are listed explicitly
+_JOB_KEYWORD_RE = re.compile(
+    r"(?<![a-z])(?:" + "|".join([
+        'application', 'applications', 'resume', 'resumes', 'cv', 'cvs',
+        'job', 'jobs', 'position', 'positions', 'role', 'roles',
+        'candidate', 'candidates', 'candidacy', 'apply', 'applying', 'applied',
+        'hiring', 'career', 'careers', 'employment',
+        'interview', 'interviews', 'opportunity', 'opportunities', 'opening', 'openings'
+    ]) + r")(?![a-z])",
+    re.IGNORECASE
+)
+
+_JOB_DOMAIN_RE = _substring_pattern([
+    'indeed.com', 'linkedin.com', 'glassdoor.com', 'monster.com',
+    'careerbuilder.com', 'ziprecruiter.com', 'simplyhired.com'
+])
+
 class EmailPollingService:
     """Service for polling Gmail accounts for new emails"""
     
+    # Category tabs excluded from polling, as labels on history records
+    SKIPPED_CATEGORY_LABELS = frozenset({
+        'CATEGORY_PROMOTIONS', 'CATEGORY_SOCIAL', 'CATEGORY_UPDATES', 'CATEGORY_FORUMS'
+    })
+    # Access tokens are refreshed this long before Gmail would reject them
+    TOKEN_EXPIRY_SKEW = timedelta(seconds=60)
+    # messages.get calls per Gmail batch request; Gmail caps a batch at 100
+    # calls and recommends staying well under that to avoid rate limiting
+    DETAIL_BATCH_SIZE = 50
+    
     def __init__(self):
         self.is_running = False
         self.polling_interval = 30  # Poll every 5 minutes (300 seconds)
         self.polling_task = None
+        # Accounts polled at the same time; each gets its own DB session
+        self.max_concurrent_accounts = 8
+        # Active gmail_configs rows read per query
+        self.config_page_size = 100
+        # Shared Gmail API client so polls reuse pooled keep-alive connections
+        self._http: Optional[httpx.AsyncClient] = None
+        # Caps concurrent messages.get calls to stay under Gmail's per-user rate limit
+        self._detail_sem = asyncio.Semaphore(5)
+        # Decrypted access token and its expiry, per gmail_configs id
+        self._token_cache: Dict[str, Tuple[str, datetime]] = {}
+        # (ciphertext, plaintext) of each config's refresh token; a changed
+        # ciphertext in gmail_configs means a new token and a fresh decrypt
+        self._refresh_tokens: Dict[str, Tuple[str, str]] = {}
+        # gmail_configs id per polled address, to reuse the cached token for follow-up calls
+        self._config_ids: Dict[str, str] = {}
+        # Accounts with an active Gmail push watch are handled by the webhook and
+        # only swept on every Nth poll, as a fallback for missed notifications
+        self.watch_fallback_every = 10
+        # How often the loop renews push watches close to Gmail's 7-day expiry
+        self.watch_renewal_interval = timedelta(hours=6)
+        self._last_watch_renewal: Optional[datetime] = None
+        
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the shared Gmail API client, creating it on first use"""
+        if self._http is None or self._http.is_closed:
+            # HTTP/2 multiplexes the concurrent detail and fallback requests over one connection
+            self._http = httpx.AsyncClient(
+                base_url="https://gmail.googleapis.com",
+                http2=True,
+                headers={'Accept': 'application/json'},
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._http
+    
+    async def _gmail_request(self, method: str, url: str, tries: int = 4, base: float = 0.5, cap: float = 8.0, **kwargs) -> httpx.Response:
+        """Send a Gmail API request, retrying transport errors, 429 and 5xx with jittered backoff"""
+        for attempt in range(tries):
+            last_attempt = attempt == tries - 1
+            try:
+                response = await self._get_http().request(method, url, **kwargs)
+                if response.status_code != 429 and response.status_code < 500:
+                    return response
+                if last_attempt:
+                    return response
+                logger.warning(f"⚠️ Gmail returned {response.status_code} for {url}, retrying")
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"⚠️ Gmail request to {url} failed ({e!r}), retrying")
+            # No sleep after the final attempt; it returns or raises above
+            await asyncio.sleep(min(cap, base * 2 ** attempt) + random.uniform(0, 0.25))
+    
+    @staticmethod
+    def _auth_headers(access_token: str) -> Dict[str, str]:
+        """Per-account headers for a Gmail API call; the static ones are client defaults"""
+        return {'Authorization': f'Bearer {access_token}'}
         
     async def start_polling(self):
         """Start the email polling service"""
@@ -27,6 +143,7 @@ class EmailPollingService:
             
         self.is_running = True
         logger.info("🚀 Starting email polling service...")
+        self._get_http()
         
         # Start polling in background
         self.polling_task = asyncio.create_task(self._poll_loop())
@@ -44,6 +161,9 @@ class EmailPollingService:
                 await self.polling_task
             except asyncio.CancelledError:
                 pass
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
         logger.info("🛑 Email polling service stopped")
         return True
         
@@ -73,49 +193,115 @@ class EmailPollingService:
     async def _poll_loop(self):
         """Main polling loop"""
         poll_count = 0
+        error_streak = 0
         while self.is_running:
             try:
                 poll_count += 1
                 logger.info(f"🔄 Starting email poll #{poll_count} (interval: {self.polling_interval/60:.1f} minutes)")
-                await self._poll_all_accounts()
+                await self._renew_watches_if_due()
+                # The first poll and every Nth one after it also cover watched accounts
+                await self._poll_all_accounts(
+                    include_watched=(poll_count - 1) % self.watch_fallback_every == 0
+                )
                 logger.info(f"✅ Poll #{poll_count} completed. Next poll in {self.polling_interval/60:.1f} minutes")
+                error_streak = 0
                 await asyncio.sleep(self.polling_interval)
             except asyncio.CancelledError:
                 logger.info("🛑 Polling loop cancelled")
                 break
             except Exception as e:
                 logger.error(f"❌ Error in polling loop (poll #{poll_count}): {e}")
-                await asyncio.sleep(10)  # Wait 10 seconds before retrying
-                
-    async def _poll_all_accounts(self):
-        """Poll all configured Gmail accounts"""
+                # 10s after the first failure, doubling up to the polling interval
+                error_streak += 1
+                delay = min(self.polling_interval, 10 * 2 ** (error_streak - 1))
+                await asyncio.sleep(delay + random.uniform(0, 1))
+                
+    async def _renew_watches_if_due(self):
+        """Renew expiring Gmail push watches, at most once per watch_renewal_interval"""
+        now = datetime.utcnow()
+        if self._last_watch_renewal and now - self._last_watch_renewal < self.watch_renewal_interval:
+            return
+        self._last_watch_renewal = now
+        
         try:
-            # Get database session
-            async for db in get_db():
-                # Get all active Gmail configurations
-                result = await db.execute(
-                    text("SELECT * FROM gmail_configs WHERE is_active = true")
-                )
-                configs = result.fetchall()
+            from services.gmail_watch_manager import gmail_watch_manager
+            
+            async with AsyncSessionLocal() as db:
+                result = await gmail_watch_manager.renew_expiring_watches(db)
+            if result.get('renewed_count') or result.get('failed_count'):
+                logger.info(f"📡 {result['message']}")
+        except Exception as e:
+            logger.error(f"❌ Error renewing Gmail watches: {e}")
+    
+    async def _poll_all_accounts(self, include_watched: bool = True):
+        """Poll all configured Gmail accounts
+        
+        With include_watched=False, accounts that have an active, unexpired push
+        watch are skipped since the Gmail webhook already delivers their mail.
+        """
+        try:
+            sem = asyncio.Semaphore(self.max_concurrent_accounts)
+            polled = 0
+            last_id = None
+            
+            # Active configurations a page at a time, keyset-paginated on id so
+            # each query is a bounded walk of idx_gmail_configs_active
+            while True:
+                query = """
+                    SELECT id, gmail_address, access_token, refresh_token, token_expires_at, history_id
+                    FROM gmail_configs
+                    WHERE is_active = true
+                """
+                params = {"limit": self.config_page_size}
+                if not include_watched:
+                    query += """
+                      AND NOT EXISTS (
+                          SELECT 1 FROM gmail_watches gw
+                          WHERE gw.user_email = gmail_configs.gmail_address
+                            AND gw.is_active = true
+                            AND gw.expiration > :now
+                      )
+                    """
+                    params["now"] = datetime.utcnow()
+                if last_id is not None:
+                    query += " AND id > :last_id"
+                    params["last_id"] = last_id
+                query += " ORDER BY id LIMIT :limit"
+                
+                async with AsyncSessionLocal() as db:
+                    result = await db.execute(text(query), params)
+                    configs = [dict(config._mapping) for config in result.fetchall()]
                 
                 if not configs:
-                    logger.debug("No active Gmail configurations found")
-                    return
+                    break
                 
                 logger.info(f"📧 Polling {len(configs)} Gmail account(s)...")
+                await asyncio.gather(*(self._poll_account_limited(sem, config) for config in configs))
+                polled += len(configs)
                 
-                for config in configs:
-                    config_dict = dict(config._mapping)
-                    await self._poll_single_account(db, config_dict)
+                if len(configs) < self.config_page_size:
+                    break
+                last_id = configs[-1]['id']
+            
+            if not polled:
+                logger.debug("No active Gmail configurations found")
+                return
                     
         except Exception as e:
             logger.error(f"Error polling Gmail accounts: {e}")
+    
+    async def _poll_account_limited(self, sem: asyncio.Semaphore, config: Dict[str, Any]):
+        """Poll one account under `sem`, in a session of its own"""
+        async with sem:
+            async with AsyncSessionLocal() as db:
+                await self._poll_single_account(db, config)
             
     async def _poll_single_account(self, db: AsyncSession, config: Dict[str, Any]):
         """Poll a single Gmail account for new emails"""
         try:
             email_address = config['gmail_address']
-            logger.debug(f"📬 Polling {email_address}...")
+            logger.debug("📬 Polling %s...", email_address)
+            self._config_ids[email_address.lower()] = str(config['id'])
             
             # Get fresh access token
             access_token = await self._get_valid_access_token(config)
@@ -123,25 +309,45 @@ class EmailPollingService:
                 logger.warning(f"⚠️  No valid access token for {email_address}")
                 return
                 
-            # Get recent emails (last 24 hours)
-            emails = await self._fetch_recent_emails(email_address, access_token)
+            # Get the emails added since the stored history cursor (or the last 24 hours)
+            emails, next_history_id = await self._fetch_recent_emails(
+                email_address, access_token, str(config['id']), config.get('history_id')
+            )
             
             if emails:
                 logger.info(f"📨 Found {len(emails)} new emails in {email_address}")
-                await self._process_emails(db, emails, email_address)
+                processed = await self._process_emails(db, emails, email_address)
             else:
-                logger.debug(f"📭 No new emails in {email_address}")
+                logger.debug("📭 No new emails in %s", email_address)
+                processed = True
+            
+            # The cursor only moves past messages that were fetched and processed,
+            # so a failed poll picks the same messages up again next time
+            if processed and next_history_id and next_history_id != config.get('history_id'):
+                await self._update_history_id_in_db(str(config['id']), next_history_id)
                 
         except Exception as e:
             logger.error(f"Error polling {config.get('gmail_address', 'unknown')}: {e}")
             
+    def _decrypt_refresh_token(self, config_id: str, encrypted_token: Optional[str]) -> Optional[str]:
+        """Decrypt a config's refresh token, once per stored ciphertext"""
+        if not encrypted_token:
+            return None
+        cached = self._refresh_tokens.get(config_id)
+        if cached and cached[0] == encrypted_token:
+            return cached[1]
+        refresh_token = gmail_service._decrypt_token(encrypted_token)
+        self._refresh_tokens[config_id] = (encrypted_token, refresh_token)
+        return refresh_token
+    
     async def _get_valid_access_token(self, config: Dict[str, Any]) -> Optional[str]:
         """Get a valid access token, refreshing if necessary"""
+        config_id = str(config['id'])
+        cached = self._token_cache.get(config_id)
+        if cached and datetime.utcnow() + self.TOKEN_EXPIRY_SKEW < cached[1]:
+            return cached[0]
+        
         try:
-            # Decrypt tokens
-            access_token = gmail_service._decrypt_token(config['access_token'])
-            refresh_token = gmail_service._decrypt_token(config['refresh_token'])
-            
             # Check if current token is still valid
             if config.get('token_expires_at'):
                 try:
@@ -151,20 +357,24 @@ class EmailPollingService:
                     else:
                         expires_at = config['token_expires_at']
                         
-                    if datetime.utcnow() < expires_at:
+                    if datetime.utcnow() + self.TOKEN_EXPIRY_SKEW < expires_at:
+                        access_token = gmail_service._decrypt_token(config['access_token'])
+                        self._token_cache[config_id] = (access_token, expires_at)
                         return access_token
                 except (ValueError, TypeError) as e:
                     logger.warning(f"Invalid token expiration format: {e}")
                     # Continue to refresh token
                     
             # Token is expired or about to expire, refresh it
+            refresh_token = self._decrypt_refresh_token(config_id, config['refresh_token'])
             if refresh_token:
                 logger.info(f"🔄 Refreshing access token for {config['gmail_address']}")
                 new_tokens = await gmail_service.refresh_access_token(refresh_token)
                 
-                # Update the database with new tokens
-                await self._update_tokens_in_db(config['id'], new_tokens)
+                # Saved right away so other sessions and a restarted worker see the new token
+                await self._update_tokens_in_db(config_id, new_tokens)
                 
+                self._token_cache[config_id] = (new_tokens['access_token'], new_tokens['expires_at'])
                 return new_tokens['access_token']
             else:
                 logger.warning(f"⚠️  No refresh token available for {config['gmail_address']}")
@@ -174,107 +384,244 @@ class EmailPollingService:
             logger.error(f"Error getting valid access token: {e}")
             return None
             
-    async def _fetch_recent_emails(self, email_address: str, access_token: str) -> List[Dict[str, Any]]:
-        """Fetch recent unread emails from Gmail Primary inbox only (excludes Promotions, Social, Updates tabs)"""
+    async def _fetch_recent_emails(self, email_address: str, access_token: str, config_id: Optional[str] = None,
+                                   history_id: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch recent unread emails from Gmail Primary inbox only (excludes Promotions, Social, Updates tabs)
+        
+        Returns the emails and the historyId to resume from once they are
+        processed, or None for the latter when some messages couldn't be fetched.
+        """
         try:
-            # Calculate time range (last 24 hours)
-            now = datetime.utcnow()
-            yesterday = now - timedelta(days=1)
-            
-            # Format for Gmail API query (YYYY/MM/DD format)
-            after_date = yesterday.strftime('%Y/%m/%d')
-            
-            # Gmail API query for unread emails in Primary inbox only from last 24 hours
-            # Use label-based filtering to exclude category tabs
-            query = f'is:unread in:inbox -category:promotions -category:social -category:updates -category:forums after:{after_date}'
-            
-            logger.info(f"🔍 Polling {email_address} with query: '{query}'")
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f'https://gmail.googleapis.com/gmail/v1/users/{email_address}/messages',
-                    headers={
-                        'Authorization': f'Bearer {access_token}',
-                        'Content-Type': 'application/json'
-                    },
-                    params={
-                        'q': query,  # Use the proper query with category exclusions
-                        'maxResults': 50,  # Limit results
-                        'includeSpamTrash': False
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    messages = data.get('messages', [])
-                    
-                    logger.info(f"📊 Found {len(messages)} unread emails in Primary inbox for {email_address}")
-                    
-                    # Get full email details for each message
-                    emails = []
-                    for i, msg in enumerate(messages[:10]):  # Process only first 10 to avoid rate limits
-                        logger.info(f"📥 Fetching email {i+1}/{min(len(messages), 10)} (ID: {msg['id']})")
-                        email_detail = await self._fetch_email_detail(email_address, access_token, msg['id'])
-                        if email_detail:
-                            emails.append(email_detail)
-                    
-                    logger.info(f"✅ Successfully fetched {len(emails)} email details")
-                    return emails
-                else:
-                    logger.error(f"❌ Failed to fetch emails: {response.status_code} - {response.text}")
-                    logger.error(f"   📧 Email: {email_address}")
-                    logger.error(f"   🔍 Query: {query}")
-                    return []
+            # With a stored history cursor only the messages added since the
+            # previous poll are fetched; the 24-hour query is the fallback
+            fetched = None
+            if history_id:
+                fetched = await self._fetch_new_message_ids(email_address, access_token, config_id, history_id)
+            if fetched is None:
+                fetched = await self._list_unread_message_ids(email_address, access_token, config_id)
+            message_ids, next_history_id = fetched
+            if not message_ids:
+                return [], next_history_id
+            
+            logger.info(f"📥 Fetching {len(message_ids)} email(s)")
+            emails: List[Dict[str, Any]] = []
+            for start in range(0, len(message_ids), self.DETAIL_BATCH_SIZE):
+                chunk = message_ids[start:start + self.DETAIL_BATCH_SIZE]
+                chunk_emails = await self._fetch_email_details_batch(email_address, access_token, chunk)
+                if chunk_emails is None:
+                    details = await asyncio.gather(*(
+                        self._fetch_email_detail_limited(email_address, access_token, message_id)
+                        for message_id in chunk
+                    ), return_exceptions=True)
+                    chunk_emails = [detail for detail in details if detail and not isinstance(detail, BaseException)]
+                emails.extend(chunk_emails)
+            
+            logger.info(f"✅ Successfully fetched {len(emails)} email details")
+            if len(emails) < len(message_ids):
+                # Keep the cursor where it was so the missing messages are retried
+                next_history_id = None
+            return emails, next_history_id
                     
         except Exception as e:
             logger.error(f"Error fetching emails: {e}")
+            return [], None
+    
+    async def _list_unread_message_ids(self, email_address: str, access_token: str,
+                                       config_id: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """Ids of up to 10 unread Primary inbox messages from the last 24 hours,
+        and the mailbox's current historyId to seed the history cursor with"""
+        # Read the historyId first so anything arriving during this poll is picked up next time
+        next_history_id = None
+        if config_id:
+            response = await self._gmail_request(
+                'GET', f'/gmail/v1/users/{email_address}/profile',
+                headers=self._auth_headers(access_token),
+                params={'fields': 'historyId'}
+            )
+            if response.status_code == 200:
+                next_history_id = response.json().get('historyId')
+        
+        # Calculate time range (last 24 hours)
+        now = datetime.utcnow()
+        yesterday = now - timedelta(days=1)
+        
+        # Format for Gmail API query (YYYY/MM/DD format)
+        after_date = yesterday.strftime('%Y/%m/%d')
+        
+        # Gmail API query for unread emails in Primary inbox only from last 24 hours
+        # Use label-based filtering to exclude category tabs
+        query = f'is:unread in:inbox -category:promotions -category:social -category:updates -category:forums after:{after_date}'
+        
+        logger.info(f"🔍 Polling {email_address} with query: '{query}'")
+        
+        response = await self._gmail_request(
+            'GET', f'/gmail/v1/users/{email_address}/messages',
+            headers=self._auth_headers(access_token),
+            params={
+                'q': query,  # Use the proper query with category exclusions
+                'maxResults': 10,  # Only the first 10 are processed, to avoid rate limits
+                'includeSpamTrash': False,
+                'fields': 'messages/id'  # Only ids are used; details come from messages.get
+            }
+        )
+        
+        if response.status_code == 200:
+            messages = response.json().get('messages', [])
+            logger.info(f"📊 Found {len(messages)} unread emails in Primary inbox for {email_address}")
+            return [msg['id'] for msg in messages], next_history_id
+        else:
+            if response.status_code == 401 and config_id:
+                # Revoked or rotated token; refresh it on the next poll
+                self._token_cache.pop(config_id, None)
+            logger.error(f"❌ Failed to fetch emails: {response.status_code} - {response.text}")
+            logger.error(f"   📧 Email: {email_address}")
+            logger.error(f"   🔍 Query: {query}")
+            return [], None
+    
+    async def _fetch_new_message_ids(self, email_address: str, access_token: str, config_id: str,
+                                     history_id: str) -> Optional[Tuple[List[str], str]]:
+        """Ids of unread Primary inbox messages added since `history_id`, and
+        the historyId they run up to.
+        
+        Returns None when the history can't be read (e.g. Gmail returns 404
+        because the id expired), so the caller falls back to the full query.
+        """
+        message_ids: List[str] = []
+        params = {
+            'startHistoryId': history_id,
+            'historyTypes': 'messageAdded',
+            'labelId': 'INBOX',
+            'fields': 'history/messagesAdded/message(id,labelIds),nextPageToken,historyId'
+        }
+        while True:
+            response = await self._gmail_request(
+                'GET', f'/gmail/v1/users/{email_address}/history',
+                headers=self._auth_headers(access_token),
+                params=params
+            )
+            if response.status_code == 401:
+                self._token_cache.pop(config_id, None)
+            if response.status_code != 200:
+                logger.warning(f"⚠️ History fetch failed for {email_address}: {response.status_code}, running full query")
+                return None
+            
+            data = response.json()
+            for record in data.get('history', []):
+                for added in record.get('messagesAdded', []):
+                    message = added.get('message', {})
+                    labels = set(message.get('labelIds', []))
+                    if 'UNREAD' in labels and 'INBOX' in labels and not labels & self.SKIPPED_CATEGORY_LABELS:
+                        message_ids.append(message['id'])
+            
+            if not data.get('nextPageToken'):
+                break
+            params['pageToken'] = data['nextPageToken']
+        
+        # A message can be added more than once across history records
+        message_ids = list(dict.fromkeys(message_ids))
+        logger.info(f"📊 Found {len(message_ids)} new unread emails in Primary inbox for {email_address}")
+        return message_ids, data.get('historyId', history_id)
+    
+    async def _fetch_email_details_batch(self, email_address: str, access_token: str, message_ids: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """Fetch up to DETAIL_BATCH_SIZE messages in one Gmail batch request.
+        
+        Returns the messages that came back 200, in request order, or None if
+        the batch call itself failed so the caller can fall back to single gets.
+        """
+        if not message_ids:
             return []
+        
+        boundary = "batch_message_details"
+        body = "".join(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <item{i}>\r\n\r\n"
+            f"GET /gmail/v1/users/{email_address}/messages/{message_id}?format=full\r\n\r\n"
+            for i, message_id in enumerate(message_ids)
+        ) + f"--{boundary}--\r\n"
+        
+        try:
+            response = await self._gmail_request('POST',
+                '/batch/gmail/v1',
+                headers={
+                    **self._auth_headers(access_token),
+                    'Content-Type': f'multipart/mixed; boundary={boundary}'
+                },
+                content=body.encode()
+            )
+            if response.status_code != 200:
+                logger.warning(f"Batch fetch failed: {response.status_code}")
+                return None
             
+            # Each part is a raw HTTP response whose Content-ID echoes "<response-itemN>"
+            multipart = BytesParser(policy=policy.default).parsebytes(
+                b"Content-Type: " + response.headers['content-type'].encode() + b"\r\n\r\n" + response.content
+            )
+            details: Dict[int, Dict[str, Any]] = {}
+            for part in multipart.iter_parts():
+                item = re.search(r'item(\d+)', part.get('Content-ID', ''))
+                status_line, _, rest = part.get_payload(decode=True).partition(b"\n")
+                status_code = status_line.split()[1] if len(status_line.split()) > 1 else b""
+                if not item or status_code != b"200":
+                    logger.warning(f"Failed to fetch email detail in batch: {status_line.strip().decode(errors='replace')}")
+                    continue
+                payload = re.split(rb'\r?\n\r?\n', rest, maxsplit=1)[-1]
+                details[int(item.group(1))] = json.loads(payload)
+            
+            return [details[i] for i in sorted(details)]
+        except Exception as e:
+            logger.error(f"Error fetching email details in batch: {e}")
+            return None
+    
+    async def _fetch_email_detail_limited(self, email_address: str, access_token: str, message_id: str) -> Optional[Dict[str, Any]]:
+        """_fetch_email_detail under the shared concurrency cap"""
+        async with self._detail_sem:
+            return await self._fetch_email_detail(email_address, access_token, message_id)
+    
     async def _fetch_email_detail(self, email_address: str, access_token: str, message_id: str) -> Optional[Dict[str, Any]]:
         """Fetch detailed information for a specific email"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f'https://gmail.googleapis.com/gmail/v1/users/{email_address}/messages/{message_id}',
-                    headers={
-                        'Authorization': f'Bearer {access_token}',
-                        'Content-Type': 'application/json'
-                    },
-                    params={
-                        'format': 'full',  # Get full email content
-                        'metadataHeaders': ['Subject', 'From', 'Date', 'To']
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    logger.warning(f"Failed to fetch email detail: {response.status_code}")
-                    return None
+            response = await self._gmail_request(
+                'GET', f'/gmail/v1/users/{email_address}/messages/{message_id}',
+                headers=self._auth_headers(access_token),
+                params={
+                    'format': 'full',  # Get full email content
+                    'metadataHeaders': ['Subject', 'From', 'Date', 'To']
+                }
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.warning(f"Failed to fetch email detail: {response.status_code}")
+                return None
                     
         except Exception as e:
             logger.error(f"Error fetching email detail: {e}")
             return None
             
-    async def _process_emails(self, db: AsyncSession, emails: List[Dict[str, Any]], email_address: str):
-        """Process fetched emails and start workflows if needed"""
+    async def _process_emails(self, db: AsyncSession, emails: List[Dict[str, Any]], email_address: str) -> bool:
+        """Process fetched emails and start workflows if needed; False if processing stopped early"""
         try:
             for email in emails:
                 await self._process_single_email(db, email, email_address)
+            return True
                 
         except Exception as e:
             logger.error(f"Error processing emails: {e}")
+            return False
             
     async def _process_single_email(self, db: AsyncSession, email: Dict[str, Any], email_address: str):
         """Process a single email and determine if it should start a workflow"""
         try:
             # Extract email metadata
-            headers = email.get('payload', {}).get('headers', [])
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-            from_email = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), 'Unknown')
+            headers = {}
+            for header in email.get('payload', {}).get('headers', []):
+                # First occurrence wins, as with the earlier per-header scans
+                headers.setdefault(header['name'], header['value'])
+            subject = headers.get('Subject', 'No Subject')
+            from_email = headers.get('From', 'Unknown')
+            date = headers.get('Date', 'Unknown')
             
             logger.info(f"📧 Processing email:")
             logger.info(f"   📋 Subject: {subject}")
@@ -286,67 +633,26 @@ class EmailPollingService:
                 logger.info(f"🎯 Job application detected: {subject}")
                 await self._start_workflow_for_email(db, email, email_address)
             else:
-                logger.debug(f"📝 Regular email (not a job application): {subject}")
+                logger.debug("📝 Regular email (not a job application): %s", subject)
                 
         except Exception as e:
             logger.error(f"Error processing single email: {e}")
             
     def _is_job_application(self, subject: str, from_email: str) -> bool:
         """Determine if an email is likely a job application"""
-        subject_lower = subject.lower()
-        from_lower = from_email.lower()
-        
-        # First, filter out promotional/marketing emails
-        promotional_keywords = [
-            'discount', 'sale', 'offer', 'deal', 'promo', 'coupon', 'save', 
-            'limited time', 'free shipping', 'newsletter', 'unsubscribe',
-            'marketing', 'notification', 'alert', 'update', 'new feature',
-            'product', 'service', 'buy now', 'shop', 'store', 'purchase',
-            'trip', 'travel', 'hotel', 'vacation', 'booking', 'reservation',
-            'conference', 'event', 'webinar', 'seminar', 'workshop',
-            'startup', 'showcase', 'demo', 'launch', 'announcement'
-        ]
-        
-        promotional_domains = [
-            'tripadvisor.com', 'gucci.com', 'lovable.dev', 'yourstory.com',
-            'mobbin.com', 'coursiv.co', 'vervecoffee.com', 'sanimabank.com',
-            'notifications', 'no-reply', 'noreply', 'marketing', 'promo'
-        ]
-        
-        # Filter out promotional emails
-        for keyword in promotional_keywords:
-            if keyword in subject_lower:
-                logger.debug(f"📝 Filtered out promotional email with keyword '{keyword}': {subject}")
-                return False
-                
-        for domain in promotional_domains:
-            if domain in from_lower:
-                logger.debug(f"📝 Filtered out promotional email from domain '{domain}': {from_email}")
-                return False
-        
-        # Keywords that suggest job applications
-        job_keywords = [
-            'application', 'resume', 'cv', 'job', 'position', 'role',
-            'candidate', 'apply', 'hiring', 'career', 'employment',
-            'interview', 'opportunity', 'opening'
-        ]
+        # Filter out promotional/marketing emails first
+        match = _PROMOTIONAL_KEYWORD_RE.search(subject)
+        if match:
+            logger.debug("📝 Filtered out promotional email with keyword '%s': %s", match.group(0), subject)
+            return False
         
-        # Check subject for job-related keywords
-        for keyword in job_keywords:
-            if keyword in subject_lower:
-                return True
-                
-        # Check if it's from a known job board or career site
-        job_domains = [
-            'indeed.com', 'linkedin.com', 'glassdoor.com', 'monster.com',
-            'careerbuilder.com', 'ziprecruiter.com', 'simplyhired.com'
-        ]
+        match = _PROMOTIONAL_SENDER_RE.search(from_email)
+        if match:
+            logger.debug("📝 Filtered out promotional email from domain '%s': %s", match.group(0), from_email)
+            return False
         
-        for domain in job_domains:
-            if domain in from_lower:
-                return True
-                
-        return False
+        # Job-related keywords in the subject, or a known job board or career site as sender
+        return bool(_JOB_KEYWORD_RE.search(subject) or _JOB_DOMAIN_RE.search(from_email))
         
     async def _start_workflow_for_email(self, db: AsyncSession, email: Dict[str, Any], email_address: str):
         """Start a workflow for a job application email"""
@@ -354,10 +660,13 @@ class EmailPollingService:
             logger.info(f"🚀 Starting workflow for job application email")
             
             # 1. Extract email metadata
-            headers = email.get('payload', {}).get('headers', [])
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-            from_email = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), 'Unknown')
+            headers = {}
+            for header in email.get('payload', {}).get('headers', []):
+                # First occurrence wins, as with the earlier per-header scans
+                headers.setdefault(header['name'], header['value'])
+            subject = headers.get('Subject', 'No Subject')
+            from_email = headers.get('From', 'Unknown')
+            date = headers.get('Date', 'Unknown')
             
             logger.info(f"📋 Processing job application:")
             logger.info(f"   📧 Subject: {subject}")
@@ -442,10 +751,8 @@ class EmailPollingService:
             r"application for (.+)"
         ]
         
-        subject_lower = subject.lower()
-        
         for pattern in patterns:
-            match = re.search(pattern, subject_lower, re.IGNORECASE)
+            match = re.search(pattern, subject, re.IGNORECASE)
             if match:
                 job_title = match.group(1).strip()
                 # Clean up the job title
@@ -501,6 +808,18 @@ class EmailPollingService:
                 job_short_id = match.group(1)  # Extract the ID (e.g., "JOB3VV")
                 logger.info(f"   🔍 Extracted job short ID from subject: {job_short_id}")
                 
+                # Serve the cached summary only if the job hasn't changed since
+                updated_at = await db.scalar(
+                    select(Job.updated_at).where(
+                        Job.short_id == job_short_id,
+                        Job.status.in_(["active", "draft"])
+                    ).limit(1)
+                )
+                cached_job = job_cache.get_by_short_id(job_short_id, updated_at) if updated_at else None
+                if cached_job:
+                    logger.info(f"   ✅ Found existing job (cached): {cached_job['title']} (ID: {cached_job['short_id']})")
+                    return cached_job
+                
                 # Find job by short_id (exact match)
                 result = await db.execute(
                     select(Job).where(
@@ -512,14 +831,17 @@ class EmailPollingService:
                 
                 if existing_job:
                     logger.info(f"   ✅ Found existing job: {existing_job.title} (ID: {existing_job.short_id})")
-                    return {
+                    job_data = {
                         "id": existing_job.id,
                         "title": existing_job.title,
                         "short_id": existing_job.short_id,
                         "status": existing_job.status,
                         "workflow_template_id": existing_job.workflow_template_id,
-                        "department": getattr(existing_job, 'department', None)
+                        "department": getattr(existing_job, 'department', None),
+                        "company_id": existing_job.company_id
                     }
+                    job_cache.set_by_short_id(job_short_id, existing_job.updated_at, job_data)
+                    return job_data
                 else:
                     logger.warning(f"   ❌ No job found with short ID: {job_short_id}")
                     return None
@@ -544,7 +866,8 @@ class EmailPollingService:
                         "short_id": existing_job.short_id,
                         "status": existing_job.status,
                         "workflow_template_id": existing_job.workflow_template_id,
-                        "department": getattr(existing_job, 'department', None)
+                        "department": getattr(existing_job, 'department', None),
+                        "company_id": existing_job.company_id
                     }
                 else:
                     # Log available jobs for debugging
@@ -592,20 +915,31 @@ class EmailPollingService:
             logger.error(f"Error getting workflow_template_id from job: {e}")
             return None
     
+    @staticmethod
+    def _current_step_fields(step: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Denormalized CandidateWorkflow columns for a cached template step"""
+        return {
+            "current_step_detail_id": step["id"] if step else None,
+            "current_order_number": step["order_number"] if step else None,
+            "current_step_type": step["step_type"] if step else None,
+            "current_required_human_approval": step["required_human_approval"] if step else None,
+            "current_approvers": step["approvers"] if step else None,
+        }
+
     async def _find_or_create_candidate_workflow(self, db: AsyncSession, job_id: str, candidate_id: str, workflow_template_id: str, email: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Find existing candidate workflow OR create new one if doesn't exist"""
         try:
             from sqlalchemy import select
-            from models.workflow import CandidateWorkflow, WorkflowStepDetail, WorkflowTemplate
+            from models.workflow import CandidateWorkflow, WorkflowEvent
             from models.job import Job
             
-            # 1. Check if workflow exists
+            # 1. Check if an active workflow exists, on the same columns and
+            # predicate as uniq_active_candidate_workflow
             result = await db.execute(
                 select(CandidateWorkflow).where(
                     CandidateWorkflow.job_id == job_id,
                     CandidateWorkflow.candidate_id == candidate_id,
-                    CandidateWorkflow.workflow_template_id == workflow_template_id,
-                    CandidateWorkflow.is_deleted == False
+                    CandidateWorkflow.is_active
                 )
             )
             existing_workflow = result.scalar_one_or_none()
@@ -614,6 +948,8 @@ class EmailPollingService:
                 logger.info(f"   ✅ Found existing candidate workflow: {existing_workflow.id}")
                 
                 # 2. Verify all required execution records exist
+                # The job's template may have changed since this workflow started
+                workflow_template_id = str(existing_workflow.workflow_template_id)
                 execution_records_exist = await self._verify_workflow_execution_records(db, candidate_id, job_id, workflow_template_id)
                 
                 if execution_records_exist:
@@ -622,6 +958,8 @@ class EmailPollingService:
                         "id": existing_workflow.id,
                         "name": existing_workflow.name,
                         "current_step_detail_id": existing_workflow.current_step_detail_id,
+                        "current_order_number": existing_workflow.current_order_number,
+                        "current_required_human_approval": existing_workflow.current_required_human_approval,
                         "workflow_template_id": existing_workflow.workflow_template_id,
                         "started_at": existing_workflow.started_at,
                         "status": "existing"
@@ -634,6 +972,8 @@ class EmailPollingService:
                         "id": existing_workflow.id,
                         "name": existing_workflow.name,
                         "current_step_detail_id": existing_workflow.current_step_detail_id,
+                        "current_order_number": existing_workflow.current_order_number,
+                        "current_required_human_approval": existing_workflow.current_required_human_approval,
                         "workflow_template_id": existing_workflow.workflow_template_id,
                         "started_at": existing_workflow.started_at,
                         "status": "existing_updated"
@@ -648,23 +988,16 @@ class EmailPollingService:
             )
             job_title = job_result.scalar_one_or_none() or "Unknown Job"
             
-            # Get the workflow template to access steps_execution_id
-            template_result = await db.execute(
-                select(WorkflowTemplate).where(WorkflowTemplate.id == workflow_template_id)
-            )
-            template = template_result.scalar_one_or_none()
-            
-            first_step = None
-            if template and template.steps_execution_id:
-                # Get the first step from the template's steps_execution_id array
-                first_step_result = await db.execute(
-                    select(WorkflowStepDetail).where(
-                        WorkflowStepDetail.id.in_(template.steps_execution_id),
-                        WorkflowStepDetail.order_number == 1,
-                        WorkflowStepDetail.is_deleted == False
-                    ).limit(1)
-                )
-                first_step = first_step_result.scalar_one_or_none()
+            # Get the first step from the template's (cached) step details
+            first_step = await workflow_template_cache.get_step_by_order(db, workflow_template_id, 1)
+            current_step_fields = self._current_step_fields(first_step)
+            
+            started_entry = {
+                "event": "workflow_started",
+                "timestamp": datetime.utcnow().isoformat(),
+                "trigger": "email_application",
+                "email_id": email.get('id')
+            }
             
             # Create workflow instance
             workflow_instance = CandidateWorkflow(
@@ -674,23 +1007,48 @@ class EmailPollingService:
                 job_id=job_id,
                 workflow_template_id=workflow_template_id,
                 candidate_id=candidate_id,
-                current_step_detail_id=first_step.id if first_step else None,
-                execution_log=[{
-                    "event": "workflow_started",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "trigger": "email_application",
-                    "email_id": email.get('id')
-                }]
+                last_event_summary=started_entry,
+                **current_step_fields
             )
             
-            db.add(workflow_instance)
-            await db.flush()
+            try:
+                # A savepoint, so losing the race only undoes this insert
+                async with db.begin_nested():
+                    db.add(workflow_instance)
+            except IntegrityError as e:
+                if constraint_name(e) != "uniq_active_candidate_workflow":
+                    raise
+                # A concurrent poll started the active workflow for this candidate and job
+                result = await db.execute(
+                    select(CandidateWorkflow).where(
+                        CandidateWorkflow.job_id == job_id,
+                        CandidateWorkflow.candidate_id == candidate_id,
+                        CandidateWorkflow.is_active
+                    )
+                )
+                active_workflow = result.scalar_one()
+                logger.info(f"   ✅ Found active candidate workflow: {active_workflow.id}")
+                return {
+                    "id": active_workflow.id,
+                    "name": active_workflow.name,
+                    "current_step_detail_id": active_workflow.current_step_detail_id,
+                    "current_order_number": active_workflow.current_order_number,
+                    "current_required_human_approval": active_workflow.current_required_human_approval,
+                    "workflow_template_id": active_workflow.workflow_template_id,
+                    "started_at": active_workflow.started_at,
+                    "status": "existing"
+                }
+            db.add(WorkflowEvent(
+                candidate_workflow_id=workflow_instance.id,
+                event_type="workflow_started",
+                payload=started_entry
+            ))
             await db.commit()
             
             # Create execution records for all workflow steps
             if first_step:
                 execution_records_created = await self._create_execution_records_for_workflow(
-                    db, candidate_id, job_id, workflow_template_id, first_step.id
+                    db, candidate_id, job_id, workflow_template_id, first_step["id"]
                 )
                 if execution_records_created:
                     logger.info(f"   ✅ Execution records created for all workflow steps")
@@ -702,7 +1060,9 @@ class EmailPollingService:
             return {
                 "id": workflow_instance.id,
                 "name": workflow_instance.name,
-                "current_step_detail_id": first_step.id if first_step else None,
+                "current_step_detail_id": current_step_fields["current_step_detail_id"],
+                "current_order_number": current_step_fields["current_order_number"],
+                "current_required_human_approval": current_step_fields["current_required_human_approval"],
                 "workflow_template_id": workflow_template_id,
                 "started_at": workflow_instance.started_at,
                 "status": "new"
@@ -717,22 +1077,24 @@ class EmailPollingService:
         """Verify that all required execution records exist for a workflow"""
         try:
             from sqlalchemy import select, func
-            from models.workflow import WorkflowTemplate, WorkflowStepDetail
+            from models.workflow import WorkflowTemplateStep, WorkflowStepDetail
             from models.candidate_workflow_execution import CandidateWorkflowExecution
             
-            # Get the workflow template to access steps_execution_id
-            template_result = await db.execute(
-                select(WorkflowTemplate).where(WorkflowTemplate.id == workflow_template_id)
+            # Count total steps in template, through its workflow_template_step links
+            total_steps = await db.scalar(
+                select(func.count())
+                .select_from(WorkflowTemplateStep)
+                .join(WorkflowStepDetail, WorkflowStepDetail.id == WorkflowTemplateStep.step_detail_id)
+                .where(
+                    WorkflowTemplateStep.template_id == workflow_template_id,
+                    WorkflowStepDetail.is_deleted == False
+                )
             )
-            template = template_result.scalar_one_or_none()
             
-            if not template or not template.steps_execution_id:
+            if not total_steps:
                 logger.warning(f"   ⚠️ No workflow template or steps found for template: {workflow_template_id}")
                 return False
             
-            # Count total steps in template
-            total_steps = len(template.steps_execution_id)
-            
             # Count existing execution records for this candidate-job combination
             execution_count_result = await db.execute(
                 select(func.count(CandidateWorkflowExecution.id)).where(
@@ -882,8 +1244,12 @@ class EmailPollingService:
                 
                 logger.info(f"   📋 Executing step {steps_executed}: {current_step_detail_id}")
                 
-                # Check if this step requires human approval
-                approval_status = await self._check_approval_requirements(db, current_step_detail_id, current_workflow['id'], candidate, job)
+                # Check if this step requires human approval (skip the lookup only when the
+                # denormalized flag explicitly says it does not; None means unknown)
+                if current_workflow.get('current_required_human_approval') is False:
+                    approval_status = "no_approval_needed"
+                else:
+                    approval_status = await self._check_approval_requirements(db, current_step_detail_id, current_workflow['id'], candidate, job)
                 
                 if approval_status == "awaiting_approval":
                     logger.info(f"   ⏸️ Step requires approval - workflow paused")
@@ -949,7 +1315,10 @@ class EmailPollingService:
                     logger.info(f"   ✅ Step approved - checking for next step...")
                     
                     # Get next step
-                    next_step_detail_id = await self._get_next_step_detail_id(db, current_workflow['workflow_template_id'], current_step_detail_id, candidate['id'], job['id'])
+                    next_step_detail_id = await self._get_next_step_detail_id(
+                        db, current_workflow['workflow_template_id'], current_step_detail_id, candidate['id'], job['id'],
+                        current_order=current_workflow.get('current_order_number')
+                    )
                     
                     if next_step_detail_id:
                         # Check if next step should auto-start (only for steps after the first one)
@@ -969,7 +1338,9 @@ class EmailPollingService:
                         
                         # Update to next step
                         logger.info(f"   ➡️ Moving to next step: {next_step_detail_id}")
-                        await self._update_candidate_workflow_current_step(db, current_workflow['id'], next_step_detail_id)
+                        next_step_fields = await self._update_candidate_workflow_current_step(
+                            db, current_workflow['id'], next_step_detail_id, current_workflow['workflow_template_id']
+                        )
                         
                         if not should_continue:
                             if next_step_approval_status == "approval_required":
@@ -982,6 +1353,8 @@ class EmailPollingService:
                         
                         # Update current workflow data for next iteration
                         current_workflow['current_step_detail_id'] = next_step_detail_id
+                        current_workflow['current_order_number'] = next_step_fields.get('current_order_number')
+                        current_workflow['current_required_human_approval'] = next_step_fields.get('current_required_human_approval')
                         # Ensure workflow_template_id is available for next iteration
                         if 'workflow_template_id' not in current_workflow:
                             current_workflow['workflow_template_id'] = workflow.get('workflow_template_id')
@@ -1148,7 +1521,7 @@ class EmailPollingService:
                 "status": "approved"  # Still proceed with workflow
             }
     
-    async def _get_next_step_detail_id(self, db: AsyncSession, workflow_template_id: str, current_step_detail_id: str, candidate_id: str = None, job_id: str = None) -> Optional[str]:
+    async def _get_next_step_detail_id(self, db: AsyncSession, workflow_template_id: str, current_step_detail_id: str, candidate_id: str = None, job_id: str = None, current_order: Optional[int] = None) -> Optional[str]:
         """Get the next step detail ID in the workflow sequence using new execution record fields"""
         try:
             from sqlalchemy import select
@@ -1156,16 +1529,18 @@ class EmailPollingService:
             
             # If we have candidate_id and job_id, use the new efficient approach
             if candidate_id and job_id:
-                # Get current step order from execution record (no join needed!)
-                current_execution_result = await db.execute(
-                    select(CandidateWorkflowExecution.order_number).where(
-                        CandidateWorkflowExecution.workflow_step_detail_id == current_step_detail_id,
-                        CandidateWorkflowExecution.candidate_id == candidate_id,
-                        CandidateWorkflowExecution.job_id == job_id,
-                        CandidateWorkflowExecution.is_deleted == False
+                # Current step order is denormalized onto the candidate workflow;
+                # only read it from the execution record when the caller lacks it
+                if current_order is None:
+                    current_execution_result = await db.execute(
+                        select(CandidateWorkflowExecution.order_number).where(
+                            CandidateWorkflowExecution.workflow_step_detail_id == current_step_detail_id,
+                            CandidateWorkflowExecution.candidate_id == candidate_id,
+                            CandidateWorkflowExecution.job_id == job_id,
+                            CandidateWorkflowExecution.is_deleted == False
+                        )
                     )
-                )
-                current_order = current_execution_result.scalar_one_or_none()
+                    current_order = current_execution_result.scalar_one_or_none()
                 
                 if current_order is not None:
                     next_order = current_order + 1
@@ -1190,48 +1565,35 @@ class EmailPollingService:
                 else:
                     logger.warning(f"   ⚠️ Execution record not found for step {current_step_detail_id}, falling back to old method")
             
-            # Fallback to old method if execution record not found
-            from models.workflow import WorkflowTemplate, WorkflowStepDetail
-            
-            # Get the workflow template to access steps_execution_id
-            template_result = await db.execute(
-                select(WorkflowTemplate).where(WorkflowTemplate.id == workflow_template_id)
-            )
-            template = template_result.scalar_one_or_none()
+            # Fallback to the template's (cached) step details if execution record not found
+            template_steps = await workflow_template_cache.get_steps(db, workflow_template_id)
             
-            if not template or not template.steps_execution_id:
+            if not template_steps:
                 logger.warning(f"   ⚠️ No workflow template or steps found for template: {workflow_template_id}")
                 return None
             
             # Get current step detail to find its order_number
-            current_step_result = await db.execute(
-                select(WorkflowStepDetail).where(
-                    WorkflowStepDetail.id == current_step_detail_id,
-                    WorkflowStepDetail.is_deleted == False
-                )
+            current_step = next(
+                (step for step in template_steps if str(step["id"]) == str(current_step_detail_id)),
+                None
             )
-            current_step = current_step_result.scalar_one_or_none()
             
             if not current_step:
                 logger.warning(f"   ⚠️ Current step detail not found: {current_step_detail_id}")
                 return None
             
-            current_order = current_step.order_number
+            current_order = current_step["order_number"]
             next_order = current_order + 1
             
-            # Find the next step in the template's steps_execution_id with next order_number
-            next_step_result = await db.execute(
-                select(WorkflowStepDetail).where(
-                    WorkflowStepDetail.id.in_(template.steps_execution_id),
-                    WorkflowStepDetail.order_number == next_order,
-                    WorkflowStepDetail.is_deleted == False
-                ).limit(1)
+            # Find the next step in the template with next order_number
+            next_step = next(
+                (step for step in template_steps if step["order_number"] == next_order),
+                None
             )
-            next_step = next_step_result.scalar_one_or_none()
             
             if next_step:
-                logger.info(f"   ➡️ Found next step: order {next_order}, ID: {next_step.id} (fallback method)")
-                return str(next_step.id)
+                logger.info(f"   ➡️ Found next step: order {next_order}, ID: {next_step['id']} (fallback method)")
+                return str(next_step["id"])
             else:
                 logger.info(f"   🏁 No next step found after order {current_order} - workflow complete")
                 return None
@@ -1379,29 +1741,8 @@ class EmailPollingService:
     async def _ai_suggest_workflow_step(self, db: AsyncSession, workflow_template_id: str, email: Dict[str, Any], candidate: Dict[str, Any], job: Dict[str, Any]) -> str:
         """Use AI to suggest which workflow step should execute for this email"""
         try:
-            from sqlalchemy import select
-            from models.workflow import WorkflowTemplate, WorkflowStepDetail, WorkflowStep
-            
-            # Get all available steps in this workflow template
-            template_result = await db.execute(
-                select(WorkflowTemplate).where(WorkflowTemplate.id == workflow_template_id)
-            )
-            template = template_result.scalar_one_or_none()
-            
-            if not template or not template.steps_execution_id:
-                return None
-            
-            # Get all step details for this template
-            steps_result = await db.execute(
-                select(WorkflowStepDetail, WorkflowStep)
-                .join(WorkflowStep, WorkflowStepDetail.workflow_step_id == WorkflowStep.id)
-                .where(
-                    WorkflowStepDetail.id.in_(template.steps_execution_id),
-                    WorkflowStepDetail.is_deleted == False
-                )
-                .order_by(WorkflowStepDetail.order_number)
-            )
-            available_steps = steps_result.fetchall()
+            # Get all available steps in this workflow template (cached)
+            available_steps = await workflow_template_cache.get_steps(db, workflow_template_id)
             
             if not available_steps:
                 return None
@@ -1411,8 +1752,8 @@ class EmailPollingService:
             
             # Create step options for AI
             step_options = []
-            for step_detail, workflow_step in available_steps:
-                step_options.append(f"- {workflow_step.name} (ID: {step_detail.id}) - {workflow_step.step_type}: {workflow_step.description[:100]}...")
+            for step in available_steps:
+                step_options.append(f"- {step['name']} (ID: {step['id']}) - {step['step_type']}: {(step['description'] or '')[:100]}...")
             
             # Use AI to suggest the best step
             from services.portia_service import portia_service
@@ -1459,10 +1800,10 @@ class EmailPollingService:
                     return None
                 
                 # Verify the suggested step ID exists in our available steps
-                valid_step_ids = [step_detail.id for step_detail, _ in available_steps]
+                valid_step_ids = [step['id'] for step in available_steps]
                 if suggested_step_id in [str(sid) for sid in valid_step_ids]:
                     # Find the step name for logging
-                    step_name = next((ws.name for sd, ws in available_steps if str(sd.id) == suggested_step_id), "Unknown")
+                    step_name = next((step['name'] for step in available_steps if str(step['id']) == suggested_step_id), "Unknown")
                     logger.info(f"   🤖 AI suggests step: {step_name} (ID: {suggested_step_id})")
                     return suggested_step_id
                 else:
@@ -1600,6 +1941,35 @@ class EmailPollingService:
             logger.error(f"Error checking step approval requirements: {e}")
             return "no_approval_needed"  # Default to proceed if there's an error
     
+    async def _approval_request_snapshot(self, db: AsyncSession, step_detail_id, candidate: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+        """Step, candidate and job fields copied onto each approval request for the approval listings"""
+        from sqlalchemy import select
+        from models.workflow import WorkflowStepDetail, WorkflowStep
+
+        step_result = await db.execute(
+            select(
+                WorkflowStep.name,
+                WorkflowStep.display_name,
+                WorkflowStep.description,
+                WorkflowStep.step_type
+            ).join(
+                WorkflowStepDetail, WorkflowStepDetail.workflow_step_id == WorkflowStep.id
+            ).where(WorkflowStepDetail.id == step_detail_id)
+        )
+        step = step_result.first()
+
+        return {
+            "company_id": job.get("company_id"),
+            "step_name": step.name if step else None,
+            "step_display_name": step.display_name if step else None,
+            "step_description": step.description if step else None,
+            "step_type": step.step_type if step else None,
+            "candidate_name": f"{candidate.get('first_name') or ''} {candidate.get('last_name') or ''}".strip(),
+            "candidate_email": candidate.get("email"),
+            "job_title": job.get("title"),
+            "job_department": job.get("department"),
+        }
+
     async def _create_approval_requests(self, db: AsyncSession, step_detail, candidate_workflow_id: str, candidate: Dict[str, Any], job: Dict[str, Any]) -> str:
         """Create approval requests for all approvers of this step (legacy method)"""
         try:
@@ -1609,6 +1979,8 @@ class EmailPollingService:
                 logger.warning(f"   ⚠️ Step requires approval but no approvers configured")
                 return "no_approval_needed"
             
+            snapshot = await self._approval_request_snapshot(db, step_detail.id, candidate, job)
+
             # Create approval request for each approver
             approval_requests = []
             for approver_id in step_detail.approvers:
@@ -1616,7 +1988,8 @@ class EmailPollingService:
                     candidate_workflow_id=candidate_workflow_id,
                     workflow_step_detail_id=step_detail.id,
                     approver_user_id=approver_id,
-                    required_approvals=step_detail.number_of_approvals_needed or len(step_detail.approvers)
+                    required_approvals=step_detail.number_of_approvals_needed or len(step_detail.approvers),
+                    **snapshot
                 )
                 approval_requests.append(approval_request)
                 db.add(approval_request)
@@ -1647,6 +2020,8 @@ class EmailPollingService:
             logger.info(f"   📝 Approvers: {approvers}")
             logger.info(f"   📝 Required approvals: {approvals_needed}")
             
+            snapshot = await self._approval_request_snapshot(db, step_detail_id, candidate, job)
+
             # Create approval request for each approver
             approval_requests = []
             for approver_id in approvers:
@@ -1654,7 +2029,8 @@ class EmailPollingService:
                     candidate_workflow_id=candidate_workflow_id,
                     workflow_step_detail_id=step_detail_id,
                     approver_user_id=approver_id,
-                    required_approvals=approvals_needed
+                    required_approvals=approvals_needed,
+                    **snapshot
                 )
                 approval_requests.append(approval_request)
                 db.add(approval_request)
@@ -1795,36 +2171,62 @@ class EmailPollingService:
             logger.warning(f"Error extracting email content: {e}")
             return email.get('snippet', 'Email content not available')
     
-    async def _update_candidate_workflow_current_step(self, db: AsyncSession, workflow_id: str, next_step_detail_id: str):
-        """Update the current_step_detail_id in candidate_workflow"""
+    async def _update_candidate_workflow_current_step(self, db: AsyncSession, workflow_id: str, next_step_detail_id: str, workflow_template_id: str = None) -> Dict[str, Any]:
+        """Update the current step (and its denormalized columns) in candidate_workflow"""
         try:
-            from sqlalchemy import update
+            from sqlalchemy import select, update
             from models.workflow import CandidateWorkflow
             from datetime import datetime
             
+            next_step = None
+            if workflow_template_id:
+                next_step = next(
+                    (step for step in await workflow_template_cache.get_steps(db, workflow_template_id)
+                     if str(step["id"]) == str(next_step_detail_id)),
+                    None
+                )
+            if not next_step:
+                # Not in the cached template steps: read the step itself so no
+                # column keeps the previous step's value (e.g. a stale approval flag)
+                from models.workflow import WorkflowStep, WorkflowStepDetail
+                
+                step_row = (await db.execute(
+                    select(
+                        WorkflowStepDetail.order_number,
+                        WorkflowStepDetail.required_human_approval,
+                        WorkflowStepDetail.approvers,
+                        WorkflowStep.step_type
+                    )
+                    .join(WorkflowStep, WorkflowStepDetail.workflow_step_id == WorkflowStep.id)
+                    .where(WorkflowStepDetail.id == next_step_detail_id)
+                )).first()
+                if step_row:
+                    next_step = {
+                        "id": next_step_detail_id,
+                        "order_number": step_row.order_number,
+                        "step_type": step_row.step_type,
+                        "required_human_approval": step_row.required_human_approval,
+                        "approvers": step_row.approvers or [],
+                    }
+            current_step_fields = self._current_step_fields(next_step)
+            # Unknown step: its details stay NULL, which makes progression check approvals
+            current_step_fields["current_step_detail_id"] = next_step_detail_id
+            
             update_query = update(CandidateWorkflow).where(
                 CandidateWorkflow.id == workflow_id
             ).values(
-                current_step_detail_id=next_step_detail_id,
-                updated_at=datetime.utcnow()
-            )
+                updated_at=datetime.utcnow(),
+                **current_step_fields
+            ).returning(CandidateWorkflow.candidate_id, CandidateWorkflow.job_id)
             
-            await db.execute(update_query)
+            workflow_info = (await db.execute(update_query)).fetchone()
             await db.commit()
             
             logger.info(f"   ✅ Updated candidate workflow current step: {next_step_detail_id}")
             
-            # Create execution record for the new step (if we have candidate and job info)
-            # Note: This function doesn't have direct access to candidate_id and job_id
-            # We'll need to get them from the workflow record
+            # Create execution record for the new step using the candidate and job
+            # returned by the update
             try:
-                workflow_result = await db.execute(
-                    select(CandidateWorkflow.candidate_id, CandidateWorkflow.job_id).where(
-                        CandidateWorkflow.id == workflow_id
-                    )
-                )
-                workflow_info = workflow_result.fetchone()
-                
                 if workflow_info:
                     candidate_id = workflow_info.candidate_id
                     job_id = workflow_info.job_id
@@ -1851,25 +2253,23 @@ class EmailPollingService:
             except Exception as e:
                 logger.warning(f"   ⚠️ Could not create execution record for new step: {e}")
             
+            return current_step_fields
+            
         except Exception as e:
             logger.error(f"Error updating candidate workflow current step: {e}")
             await db.rollback()
+            return {}
     
     async def _update_workflow_execution_log(self, db: AsyncSession, workflow_id: str, step_result: Dict[str, Any], step_detail_id: str):
-        """Update the execution_log in candidate_workflow with step result"""
+        """Append a step result event for the candidate workflow"""
         try:
-            from sqlalchemy import select, update
-            from models.workflow import CandidateWorkflow
+            from sqlalchemy import update
+            from models.workflow import CandidateWorkflow, WorkflowEvent
             from datetime import datetime
             
-            # Get current execution log
-            result = await db.execute(
-                select(CandidateWorkflow.execution_log).where(CandidateWorkflow.id == workflow_id)
-            )
-            current_log = result.scalar_one_or_none() or []
-            
             # Add new log entry (convert UUIDs to strings for JSON serialization)
             log_entry = {
+                "event": "step_executed",
                 "timestamp": datetime.utcnow().isoformat(),
                 "step_detail_id": str(step_detail_id),
                 "step_result": {
@@ -1881,13 +2281,17 @@ class EmailPollingService:
                 "success": step_result.get('success', False)
             }
             
-            current_log.append(log_entry)
+            # Insert the event instead of rewriting the whole JSONB log
+            db.add(WorkflowEvent(
+                candidate_workflow_id=workflow_id,
+                event_type="step_executed",
+                payload=log_entry
+            ))
             
-            # Update the execution log
             update_query = update(CandidateWorkflow).where(
                 CandidateWorkflow.id == workflow_id
             ).values(
-                execution_log=current_log,
+                last_event_summary=log_entry,
                 updated_at=datetime.utcnow()
             )
             
@@ -1918,9 +2322,9 @@ class EmailPollingService:
             update_query = update(CandidateWorkflow).where(
                 CandidateWorkflow.id == workflow_id
             ).values(
-                current_step_detail_id=None,  # No more steps
                 completed_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                updated_at=datetime.utcnow(),
+                **self._current_step_fields(None)  # No more steps
             )
             
             await db.execute(update_query)
@@ -1954,15 +2358,9 @@ class EmailPollingService:
         """Mark workflow as rejected"""
         try:
             from sqlalchemy import select, update
-            from models.workflow import CandidateWorkflow
+            from models.workflow import CandidateWorkflow, WorkflowEvent
             from datetime import datetime
             
-            # Get current execution log to add rejection entry
-            result = await db.execute(
-                select(CandidateWorkflow.execution_log).where(CandidateWorkflow.id == workflow_id)
-            )
-            current_log = result.scalar_one_or_none() or []
-            
             # Add rejection log entry
             rejection_entry = {
                 "timestamp": datetime.utcnow().isoformat(),
@@ -1971,7 +2369,11 @@ class EmailPollingService:
                 "status": "rejected"
             }
             
-            current_log.append(rejection_entry)
+            db.add(WorkflowEvent(
+                candidate_workflow_id=workflow_id,
+                event_type="workflow_rejected",
+                payload=rejection_entry
+            ))
             
             # Get current step detail ID to update its status
             current_step_detail_id = None
@@ -1984,10 +2386,10 @@ class EmailPollingService:
             update_query = update(CandidateWorkflow).where(
                 CandidateWorkflow.id == workflow_id
             ).values(
-                current_step_detail_id=None,  # No more steps
                 completed_at=datetime.utcnow(),
-                execution_log=current_log,
-                updated_at=datetime.utcnow()
+                last_event_summary=rejection_entry,
+                updated_at=datetime.utcnow(),
+                **self._current_step_fields(None)  # No more steps
             )
             
             await db.execute(update_query)
@@ -2023,12 +2425,7 @@ class EmailPollingService:
     async def _update_tokens_in_db(self, config_id: str, new_tokens: Dict[str, Any]):
         """Update tokens in the database after refresh"""
         try:
-            async for db in get_db():
-                # Encrypt new tokens
-                encrypted_access = gmail_service._encrypt_token(new_tokens['access_token'])
-                encrypted_refresh = gmail_service._encrypt_token(new_tokens['refresh_token'])
-                
-                # Update database
+            async with AsyncSessionLocal() as db:
                 await db.execute(
                     text("""
                         UPDATE gmail_configs 
@@ -2039,8 +2436,8 @@ class EmailPollingService:
                         WHERE id = :config_id
                     """),
                     {
-                        'access_token': encrypted_access,
-                        'refresh_token': encrypted_refresh,
+                        'access_token': gmail_service._encrypt_token(new_tokens['access_token']),
+                        'refresh_token': gmail_service._encrypt_token(new_tokens['refresh_token']),
                         'expires_at': new_tokens['expires_at'].isoformat(),
                         'config_id': config_id
                     }
@@ -2051,6 +2448,23 @@ class EmailPollingService:
         except Exception as e:
             logger.error(f"Error updating tokens in database: {e}")
     
+    async def _update_history_id_in_db(self, config_id: str, history_id: str):
+        """Store the Gmail history cursor the next poll resumes from"""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    text("""
+                        UPDATE gmail_configs
+                        SET history_id = :history_id
+                        WHERE id = :config_id
+                    """),
+                    {'history_id': history_id, 'config_id': config_id}
+                )
+                await db.commit()
+                
+        except Exception as e:
+            logger.error(f"Error updating history id in database: {e}")
+    
     async def _mark_email_as_read(self, email: Dict[str, Any]):
         """Mark an email as read using Gmail API"""
         try:
@@ -2079,45 +2493,41 @@ class EmailPollingService:
             if email_match:
                 recipient_email = email_match.group(1)
             
-            # Get Gmail config for this email address
-            from services.gmail_service import GmailService
-            gmail_service = GmailService()
-            
-            # Get database session
-            from core.database import get_db
-            async for db in get_db():
-                gmail_config = await gmail_service.get_gmail_config_by_email(db, recipient_email)
-                break
-            
-            if not gmail_config:
-                logger.warning(f"   ⚠️ No Gmail config found for {recipient_email}, cannot mark email as read")
-                return
-            
-            # Get valid access token
-            access_token = await gmail_service.get_valid_access_token(gmail_config)
+            # Reuse the token the poll already holds for this account
+            access_token = None
+            config_id = self._config_ids.get(recipient_email.lower())
+            cached = self._token_cache.get(config_id) if config_id else None
+            if cached and datetime.utcnow() + self.TOKEN_EXPIRY_SKEW < cached[1]:
+                access_token = cached[0]
+            else:
+                # Get Gmail config for this email address
+                async with AsyncSessionLocal() as db:
+                    gmail_config = await gmail_service.get_gmail_config_by_email(db, recipient_email)
+                
+                if not gmail_config:
+                    logger.warning(f"   ⚠️ No Gmail config found for {recipient_email}, cannot mark email as read")
+                    return
+                
+                # Get valid access token
+                access_token = await gmail_service.get_valid_access_token(gmail_config)
             if not access_token:
                 logger.warning(f"   ⚠️ No valid access token for {recipient_email}, cannot mark email as read")
                 return
             
             # Mark email as read using Gmail API
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f'https://gmail.googleapis.com/gmail/v1/users/{recipient_email}/messages/{email_id}/modify',
-                    headers={
-                        'Authorization': f'Bearer {access_token}',
-                        'Content-Type': 'application/json'
-                    },
-                    json={
-                        'removeLabelIds': ['UNREAD']  # Remove the UNREAD label to mark as read
-                    },
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    logger.info(f"   ✅ Email {email_id[:8]}... marked as read successfully")
-                else:
-                    logger.warning(f"   ⚠️ Failed to mark email as read: {response.status_code} - {response.text}")
+            response = await self._gmail_request(
+                'POST', f'/gmail/v1/users/{recipient_email}/messages/{email_id}/modify',
+                headers=self._auth_headers(access_token),
+                json={
+                    'removeLabelIds': ['UNREAD']  # Remove the UNREAD label to mark as read
+                },
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                logger.info(f"   ✅ Email {email_id[:8]}... marked as read successfully")
+            else:
+                logger.warning(f"   ⚠️ Failed to mark email as read: {response.status_code} - {response.text}")
                     
         except Exception as e:
             logger.error(f"   ❌ Error marking email as read: {e}")
@@ -2241,13 +2651,16 @@ class EmailPollingService:
                 'approved': 'finished',      # Step completed successfully
                 'rejected': 'rejected',      # Step was rejected
                 'pending': 'pending',        # Step is waiting
+                'in_progress': 'running',    # Step is executing
+                'running': 'running',        # Step is executing
                 'completed': 'finished',     # Step completed
                 'success': 'finished',       # Step succeeded
                 'failed': 'failed'           # Step failed
             }
             
-            # Get the mapped execution status
-            execution_status = status_mapping.get(status, status)
+            # Get the mapped execution status (the column is an enum, so unknown
+            # results leave the step pending rather than failing the write)
+            execution_status = status_mapping.get(status, 'pending')
             logger.info(f"   🔄 Mapping status '{status}' to execution status '{execution_status}'")
             
             # Check if execution record already exists
@@ -2397,32 +2810,20 @@ class EmailPollingService:
         """Create execution records for all steps in a workflow template"""
         try:
             from sqlalchemy import select
-            from models.workflow import WorkflowTemplate, WorkflowStepDetail
+            from models.workflow import WorkflowTemplateStep, WorkflowStepDetail
             from models.candidate_workflow_execution import CandidateWorkflowExecution
             from datetime import datetime
             
-            # Get the workflow template to access steps_execution_id
-            template_result = await db.execute(
-                select(WorkflowTemplate).where(WorkflowTemplate.id == workflow_template_id)
-            )
-            template = template_result.scalar_one_or_none()
-            
-            logger.info(f"   🔍 Template found: {template.id if template else 'None'}")
-            logger.info(f"   🔍 Template steps_execution_id: {template.steps_execution_id if template else 'None'}")
-            
-            if not template or not template.steps_execution_id:
-                logger.warning(f"   ⚠️ No workflow template or steps found for template: {workflow_template_id}")
-                return False
-            
-            # Get all step details for this template with eager loading
-            logger.info(f"   🔍 Template steps_execution_id: {template.steps_execution_id}")
-            logger.info(f"   🔍 Template has {len(template.steps_execution_id)} steps")
-            
+            # Get all step details for this template, in template order, through
+            # its workflow_template_step links
             steps_result = await db.execute(
-                select(WorkflowStepDetail).where(
-                    WorkflowStepDetail.id.in_(template.steps_execution_id),
+                select(WorkflowStepDetail)
+                .join(WorkflowTemplateStep, WorkflowTemplateStep.step_detail_id == WorkflowStepDetail.id)
+                .where(
+                    WorkflowTemplateStep.template_id == workflow_template_id,
                     WorkflowStepDetail.is_deleted == False
-                ).order_by(WorkflowStepDetail.order_number)
+                )
+                .order_by(WorkflowTemplateStep.order_number)
             )
             steps = steps_result.scalars().all()
             
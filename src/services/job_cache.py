@@ -0,0 +1,69 @@
+"""
+In-process cache for job lookups by id and short_id.
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class JobCache:
+    """
+    Caches job data that is read far more often than it is written: the
+    job summaries used to route inbound emails (keyed by short_id) and
+    single-job API responses (keyed by job id).
+
+    Every entry is stored with the job's updated_at, and a lookup only hits
+    when the caller passes the same value, read from the row just before.
+    That keeps processes that didn't make a change from serving it stale;
+    the jobs API also invalidates entries on update and delete, and entries
+    expire after `ttl` seconds. Lookups return copies, so a caller that
+    changes the result does not change what other requests are served.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self._by_id = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._by_short_id = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _id_key(job_id) -> int:
+        return (job_id if isinstance(job_id, UUID) else UUID(str(job_id))).int
+
+    def get_by_id(self, job_id, updated_at) -> Optional[Tuple[Any, Any]]:
+        """Return (company_id, job response) for a job cached at `updated_at`, or None"""
+        entry = self._by_id.get(self._id_key(job_id))
+        if entry is None or entry[0] != updated_at:
+            return None
+        _, company_id, response = entry
+        return company_id, response.model_copy(deep=True)
+
+    def set_by_id(self, job_id, company_id, updated_at, response: Any) -> None:
+        self._by_id.set(self._id_key(job_id), (updated_at, company_id, response.model_copy(deep=True)))
+
+    def get_by_short_id(self, short_id: str, updated_at) -> Optional[Dict[str, Any]]:
+        """Return the job summary cached at `updated_at`, or None"""
+        entry = self._by_short_id.get(short_id)
+        if entry is None or entry[0] != updated_at:
+            return None
+        return dict(entry[1])
+
+    def set_by_short_id(self, short_id: str, updated_at, job: Dict[str, Any]) -> None:
+        self._by_short_id.set(short_id, (updated_at, dict(job)))
+
+    def invalidate(self, job_id, short_id: Optional[str] = None) -> None:
+        """Drop cached entries for a job after it changes"""
+        self._by_id.pop(self._id_key(job_id))
+        if short_id:
+            self._by_short_id.pop(short_id)
+        logger.debug(f"🗑️ Invalidated job cache for {job_id}")
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._by_short_id.clear()
+
+
+# Global instance
+job_cache = JobCache()
@@ -0,0 +1,116 @@
+"""
+Dashboard job counts served from the job_status_counts materialized view.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatsService:
+    """
+    Reads per-company job counts by status and job type from a materialized
+    view instead of aggregating the jobs table on every dashboard load.
+
+    Job writes call `schedule_refresh()`; refreshes are debounced so a burst
+    of writes triggers a single REFRESH ... CONCURRENTLY `debounce_seconds`
+    later. A write that arrives while a refresh is already running marks the
+    view dirty, and the refresh runs again once the current one finishes.
+
+    Writes from other processes, or lost with a restart before their refresh
+    ran, are caught by a backstop refresh every `backstop_interval_seconds`.
+    Every worker runs the loop, but a transaction-level advisory lock lets
+    only one of them refresh per round.
+    """
+
+    def __init__(self, debounce_seconds: float = 30.0, backstop_interval_seconds: float = 300.0):
+        self.debounce_seconds = debounce_seconds
+        self.backstop_interval_seconds = backstop_interval_seconds
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._backstop_task: Optional[asyncio.Task] = None
+        # Set by every write; cleared when a refresh starts reading the jobs table
+        self._dirty = False
+
+    def schedule_refresh(self) -> None:
+        """Refresh the view soon; a refresh already pending or running picks this write up"""
+        self._dirty = True
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_later())
+
+    async def _refresh_later(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.debounce_seconds)
+            self._dirty = False
+            try:
+                await self._refresh()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to refresh job_status_counts: {e}")
+
+    async def _refresh(self, skip_if_locked: bool = False) -> None:
+        async with AsyncSessionLocal() as session:
+            if skip_if_locked:
+                # Another worker's backstop refresh is already running this round
+                locked = await session.scalar(
+                    text("SELECT pg_try_advisory_xact_lock(hashtext('job_status_counts_refresh'))")
+                )
+                if not locked:
+                    return
+            await session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY job_status_counts"))
+            await session.commit()
+        logger.debug("🔄 Refreshed job_status_counts")
+
+    def start(self) -> None:
+        """Start the periodic backstop refresh"""
+        if self._backstop_task and not self._backstop_task.done():
+            return
+        self._backstop_task = asyncio.create_task(self._backstop())
+
+    async def stop(self) -> None:
+        """Stop the periodic backstop refresh"""
+        if self._backstop_task:
+            self._backstop_task.cancel()
+            try:
+                await self._backstop_task
+            except asyncio.CancelledError:
+                pass
+            self._backstop_task = None
+
+    async def _backstop(self) -> None:
+        while True:
+            await asyncio.sleep(self.backstop_interval_seconds)
+            try:
+                await self._refresh(skip_if_locked=True)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to refresh job_status_counts: {e}")
+
+    async def get_counts(self, db: AsyncSession, company_id) -> Dict[str, Any]:
+        """Return total, by_status and by_type job counts for a company"""
+        result = await db.execute(
+            text("""
+                SELECT status, job_type, job_count
+                FROM job_status_counts
+                WHERE company_id = :company_id
+            """),
+            {"company_id": company_id}
+        )
+
+        total = 0
+        by_status: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        for job_status, job_type, job_count in result.all():
+            total += job_count
+            by_status[job_status] = by_status.get(job_status, 0) + job_count
+            by_type[job_type] = by_type.get(job_type, 0) + job_count
+
+        return {"total": total, "by_status": by_status, "by_type": by_type}
+
+
+# Global instance
+job_stats_service = JobStatsService()
@@ -0,0 +1,73 @@
+"""
+Keeps monthly workflow_event partitions created ahead of the rows that need them.
+"""
+import asyncio
+import logging
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+
+from core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _add_months(month_start: date, months: int) -> date:
+    month_index = month_start.month - 1 + months
+    return date(month_start.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+class WorkflowEventPartitionService:
+    """
+    Adds the partitions for the current month and the next `months_ahead`
+    through workflow_event_add_partition(), once at startup and then every
+    `check_interval_seconds`, so new events never wait on a manual migration.
+    """
+
+    def __init__(self, months_ahead: int = 3, check_interval_seconds: float = 86400.0):
+        self.months_ahead = months_ahead
+        self.check_interval_seconds = check_interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def ensure_partitions(self) -> None:
+        """Create any missing partitions from this month through `months_ahead`"""
+        this_month = date.today().replace(day=1)
+        # One transaction per month: the function's advisory lock serializes
+        # workers starting together, and a failure keeps the months already added
+        for offset in range(self.months_ahead + 1):
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    text("SELECT workflow_event_add_partition(:month)"),
+                    {"month": _add_months(this_month, offset)}
+                )
+                await session.commit()
+        logger.debug("🗂️ workflow_event partitions ensured through %s months ahead", self.months_ahead)
+
+    def start(self) -> None:
+        """Start the background maintenance loop"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._maintain())
+
+    async def stop(self) -> None:
+        """Stop the background maintenance loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _maintain(self) -> None:
+        while True:
+            try:
+                await self.ensure_partitions()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to ensure workflow_event partitions: {e}")
+            await asyncio.sleep(self.check_interval_seconds)
+
+
+# Global instance
+workflow_event_partitions = WorkflowEventPartitionService()
@@ -0,0 +1,159 @@
+"""
+In-process cache of workflow templates and their ordered step details.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from models.workflow import WorkflowTemplate, WorkflowTemplateStep, WorkflowStepDetail, WorkflowStep
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _template_key(template_id) -> int:
+    return (template_id if isinstance(template_id, UUID) else UUID(str(template_id))).int
+
+
+class WorkflowTemplateCache:
+    """
+    Memoizes the ordered step details (joined with their workflow steps) of
+    each workflow template, and the serialized `WorkflowTemplatePopulated`
+    JSON of each template for the templates listing.
+
+    Both are tagged with the template's updated_at, which mapper events in
+    models.workflow bump whenever the template's step links or their step
+    rows change. Every read compares the tag with the committed updated_at,
+    so edits made by another worker or process, or committed after an
+    entry was filled, are never served. Local writes also drop entries once
+    their transaction commits; anything else expires after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self._steps = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._populated_json = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get_steps(self, db: AsyncSession, template_id) -> List[Dict[str, Any]]:
+        """Return the template's non-deleted step details ordered by order_number"""
+        key = _template_key(template_id)
+        updated_at = (await db.execute(
+            select(WorkflowTemplate.updated_at).where(WorkflowTemplate.id == template_id)
+        )).scalar_one_or_none()
+        entry = self._steps.get(key)
+        if entry is not None and entry[0] == updated_at:
+            return entry[1]
+
+        result = await db.execute(
+            select(WorkflowStepDetail, WorkflowStep)
+            .join(WorkflowTemplateStep, WorkflowTemplateStep.step_detail_id == WorkflowStepDetail.id)
+            .join(WorkflowStep, WorkflowStepDetail.workflow_step_id == WorkflowStep.id)
+            .where(
+                WorkflowTemplateStep.template_id == template_id,
+                WorkflowStepDetail.is_deleted == False
+            )
+            .order_by(WorkflowStepDetail.order_number)
+        )
+        steps = [
+            {
+                "id": step_detail.id,
+                "workflow_step_id": step_detail.workflow_step_id,
+                "order_number": step_detail.order_number,
+                "delay_in_seconds": step_detail.delay_in_seconds,
+                "auto_start": step_detail.auto_start,
+                "required_human_approval": step_detail.required_human_approval,
+                "number_of_approvals_needed": step_detail.number_of_approvals_needed,
+                "approvers": step_detail.approvers or [],
+                "name": workflow_step.name,
+                "display_name": workflow_step.display_name,
+                "description": workflow_step.description,
+                "step_type": workflow_step.step_type,
+                "actions": workflow_step.actions or [],
+            }
+            for step_detail, workflow_step in result.all()
+        ]
+
+        self._steps.set(key, (updated_at, steps))
+        return steps
+
+    async def get_step_by_order(self, db: AsyncSession, template_id, order_number: int) -> Optional[Dict[str, Any]]:
+        """Return the template's step detail with the given order_number, if any"""
+        for step in await self.get_steps(db, template_id):
+            if step["order_number"] == order_number:
+                return step
+        return None
+
+    def get_populated_json(self, template_id, updated_at) -> Optional[bytes]:
+        """Return the cached populated-template JSON if it matches updated_at"""
+        entry = self._populated_json.get(_template_key(template_id))
+        if entry is None or entry[0] != updated_at:
+            return None
+        return entry[1]
+
+    def set_populated_json(self, template_id, updated_at, payload: bytes) -> None:
+        self._populated_json.set(_template_key(template_id), (updated_at, payload))
+
+    def invalidate(self, template_id) -> None:
+        key = _template_key(template_id)
+        self._steps.pop(key)
+        self._populated_json.pop(key)
+
+    def clear(self) -> None:
+        self._steps.clear()
+        self._populated_json.clear()
+
+
+# Global instance
+workflow_template_cache = WorkflowTemplateCache()
+
+
+def _queue_invalidation(target, template_id=None) -> None:
+    """Drop cache entries once the flushing session commits, not mid-transaction"""
+    session = object_session(target)
+    if session is None:
+        return
+    pending = session.info.setdefault("invalidated_templates", set())
+    pending.add(template_id)
+
+
+@event.listens_for(WorkflowTemplate, "after_insert")
+@event.listens_for(WorkflowTemplate, "after_update")
+@event.listens_for(WorkflowTemplate, "after_delete")
+def _invalidate_template(mapper, connection, target):
+    if target.id is not None:
+        _queue_invalidation(target, target.id)
+
+
+@event.listens_for(WorkflowTemplateStep, "after_insert")
+@event.listens_for(WorkflowTemplateStep, "after_delete")
+def _invalidate_template_step(mapper, connection, target):
+    _queue_invalidation(target, target.template_id)
+
+
+@event.listens_for(WorkflowStepDetail, "after_update")
+@event.listens_for(WorkflowStepDetail, "after_delete")
+@event.listens_for(WorkflowStep, "after_update")
+@event.listens_for(WorkflowStep, "after_delete")
+def _invalidate_all_templates(mapper, connection, target):
+    # Step rows do not reference their template, so drop everything (None)
+    _queue_invalidation(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    pending = session.info.pop("invalidated_templates", None)
+    if not pending:
+        return
+    if None in pending:
+        workflow_template_cache.clear()
+        return
+    for template_id in pending:
+        workflow_template_cache.invalidate(template_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("invalidated_templates", None)
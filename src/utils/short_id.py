@@ -1,12 +1,15 @@
 """
 Short ID generation utilities for the HR automation system.
 """
-import random
+import secrets
 import string
 from typing import Set, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+# Uppercase letters and numbers for readability, built once at import
+SHORT_ID_ALPHABET = string.ascii_uppercase + string.digits
+
 
 def generate_short_id(length: int = 6, prefix: str = "") -> str:
     """
@@ -19,9 +22,7 @@ def generate_short_id(length: int = 6, prefix: str = "") -> str:
     Returns:
         Short ID string like "ABC123" or "JOB-ABC123" if prefix provided
     """
-    # Use uppercase letters and numbers for readability
-    chars = string.ascii_uppercase + string.digits
-    random_part = ''.join(random.choices(chars, k=length))
+    random_part = ''.join(secrets.choice(SHORT_ID_ALPHABET) for _ in range(length))
     
     if prefix:
         return f"{prefix}-{random_part}"